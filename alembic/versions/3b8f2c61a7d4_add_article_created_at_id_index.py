@@ -0,0 +1,32 @@
+"""add article created_at id index
+
+Revision ID: 3b8f2c61a7d4
+Revises: df150518319e
+Create Date: 2026-10-18 12:40:11.532810
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8f2c61a7d4"
+down_revision: Union[str, Sequence[str], None] = "df150518319e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_article_created_at_id",
+        "article",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_article_created_at_id", table_name="article")
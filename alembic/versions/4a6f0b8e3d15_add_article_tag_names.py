@@ -0,0 +1,74 @@
+"""add article tag_names
+
+Revision ID: 4a6f0b8e3d15
+Revises: e2c85f0d7a16
+Create Date: 2026-10-18 15:41:12.604917
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a6f0b8e3d15"
+down_revision: Union[str, Sequence[str], None] = "e2c85f0d7a16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "article",
+        sa.Column(
+            "tag_names",
+            postgresql.ARRAY(sa.Text()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+    # The constant default makes the column a catalog-only change. The backfill
+    # and the index run outside the migration's transaction, so the article
+    # table's ACCESS EXCLUSIVE lock is released before either starts; the
+    # backfill only takes row locks and CREATE INDEX CONCURRENTLY cannot run
+    # inside a transaction block.
+    # Byte order matches the sorted() the tag service applies on write.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            UPDATE article
+            SET tag_names = article_tags.names
+            FROM (
+                SELECT
+                    articletag.article_id,
+                    array_agg(tag.name ORDER BY tag.name COLLATE "C") AS names
+                FROM articletag
+                JOIN tag ON tag.id = articletag.tag_id
+                GROUP BY articletag.article_id
+            ) AS article_tags
+            WHERE article.id = article_tags.article_id
+            """)
+        op.create_index(
+            "ix_article_tag_names",
+            "article",
+            ["tag_names"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_article_tag_names",
+            table_name="article",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("article", "tag_names")
@@ -0,0 +1,56 @@
+"""add feed timeline
+
+Revision ID: 5e0a93c4f1b2
+Revises: 9c41e7d2b5a8
+Create Date: 2026-10-18 13:41:05.904417
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0a93c4f1b2"
+down_revision: Union[str, Sequence[str], None] = "9c41e7d2b5a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing articles keep fanned_out = false and are served by the pull side
+    # of the feed, so no backfill is needed here.
+    op.add_column(
+        "article",
+        sa.Column(
+            "fanned_out",
+            sa.Boolean(),
+            server_default=sa.text("false"),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "timeline",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("article_created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["article.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "article_id"),
+    )
+    op.create_index(
+        "ix_timeline_user_id_article_created_at",
+        "timeline",
+        ["user_id", "article_created_at", "article_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_timeline_user_id_article_created_at", table_name="timeline")
+    op.drop_table("timeline")
+    op.drop_column("article", "fanned_out")
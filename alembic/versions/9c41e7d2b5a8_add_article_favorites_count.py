@@ -0,0 +1,47 @@
+"""add article favorites_count
+
+Revision ID: 9c41e7d2b5a8
+Revises: 3b8f2c61a7d4
+Create Date: 2026-10-18 13:02:47.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c41e7d2b5a8"
+down_revision: Union[str, Sequence[str], None] = "3b8f2c61a7d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "article",
+        sa.Column(
+            "favorites_count",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.execute("""
+        UPDATE article
+        SET favorites_count = favorite_counts.total
+        FROM (
+            SELECT article_id, count(*) AS total
+            FROM favorite
+            GROUP BY article_id
+        ) AS favorite_counts
+        WHERE article.id = favorite_counts.article_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("article", "favorites_count")
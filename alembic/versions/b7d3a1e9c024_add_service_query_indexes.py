@@ -0,0 +1,56 @@
+"""add service query indexes
+
+Revision ID: b7d3a1e9c024
+Revises: 5e0a93c4f1b2
+Create Date: 2026-10-18 14:15:32.640981
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3a1e9c024"
+down_revision: Union[str, Sequence[str], None] = "5e0a93c4f1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# article.slug is already covered by the index behind its unique constraint,
+# and the composite primary keys cover lookups on their leading column. The
+# favorite and timeline article_id indexes also serve ON DELETE CASCADE.
+INDEXES = [
+    ("ix_article_author_id_created_at", "article", ["author_id", "created_at"]),
+    ("ix_favorite_article_id", "favorite", ["article_id"]),
+    ("ix_follower_following_id", "follower", ["following_id"]),
+    ("ix_articletag_tag_id", "articletag", ["tag_id"]),
+    ("ix_comment_article_id", "comment", ["article_id"]),
+    ("ix_timeline_article_id", "timeline", ["article_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
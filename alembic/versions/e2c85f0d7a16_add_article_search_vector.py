@@ -0,0 +1,63 @@
+"""add article search vector
+
+Revision ID: e2c85f0d7a16
+Revises: b7d3a1e9c024
+Create Date: 2026-10-18 15:08:53.275339
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2c85f0d7a16"
+down_revision: Union[str, Sequence[str], None] = "b7d3a1e9c024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column is computed for every existing row, so this
+    # rewrites the article table under an ACCESS EXCLUSIVE lock.
+    op.add_column(
+        "article",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A')"
+                " || setweight(to_tsvector('english', description), 'B')"
+                " || setweight(to_tsvector('english', body), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_article_search_vector",
+            "article",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_article_search_vector",
+            table_name="article",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("article", "search_vector")
@@ -0,0 +1,113 @@
+"""Compare the listing query before and after column projection.
+
+Run against a migrated database configured through the usual settings:
+
+    python -m benchmarks.article_listing --seed
+
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from sqlmodel import col, exists, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.common import create_engine, seed
+from conduit.models import Article, ArticleTag, Favorite, Follower, Tag, User
+from conduit.services import article as article_service
+
+
+def full_entities(current_user_id: int) -> Any:
+    # The listing query as it was: whole Article and User entities, grouped by
+    # every column, hydrated into tracked ORM instances.
+    return (
+        select(
+            Article,
+            User,
+            exists()
+            .where(
+                (Follower.follower_id == current_user_id)
+                & (Follower.following_id == Article.author_id)
+            )
+            .label("following"),
+            Article.favorites_count,
+            exists()
+            .where((Favorite.user_id == current_user_id) & (Favorite.article_id == Article.id))
+            .label("favorited"),
+            func.string_agg(Tag.name, ",").label("tags"),
+        )
+        .join(User, Article.author_id == User.id)
+        .join(ArticleTag, Article.id == ArticleTag.article_id, isouter=True)
+        .join(Tag, Tag.id == ArticleTag.tag_id, isouter=True)
+        .group_by(Article, User)
+    )
+
+
+def projected_columns(current_user_id: int) -> Any:
+    # Viewer state is no longer part of the row; see conduit.services.viewer.
+    return article_service._select_article_list_rows()
+
+
+def payload_bytes(row: Any) -> int:
+    size = 0
+    for value in row:
+        if hasattr(value, "model_dump"):
+            size += sum(len(str(item).encode()) for item in value.model_dump().values())
+        elif value is not None:
+            size += len(str(value).encode())
+    return size
+
+
+async def measure(
+    session: AsyncSession,
+    build: Callable[[int], Any],
+    *,
+    limit: int,
+    iterations: int,
+) -> Dict[str, float]:
+    page = select(Article.id).order_by(col(Article.created_at).desc()).limit(limit)
+    query = build(1).where(col(Article.id).in_(page)).order_by(col(Article.created_at).desc())
+    elapsed = 0.0
+    peak = 0
+    size = 0
+    for _ in range(iterations):
+        session.expunge_all()
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = (await session.exec(query)).all()
+        elapsed += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        size = sum(payload_bytes(row) for row in rows)
+    return {
+        "rows": len(rows),
+        "payload_kib": size / 1024,
+        "peak_memory_kib": peak / 1024,
+        "latency_ms": elapsed / iterations * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic articles first")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine()
+    if args.seed:
+        await seed(engine)
+    async with AsyncSession(engine) as session:
+        for name, build in (("full entities", full_entities), ("projected", projected_columns)):
+            result = await measure(session, build, limit=args.limit, iterations=args.iterations)
+            print(
+                f"{name:>14}: " + ", ".join(f"{key}={value:.1f}" for key, value in result.items())
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""Compare access-token verification with and without the verified-token cache.
+
+No database is needed; this times the decode step shared by the auth
+dependencies for a pool of distinct session tokens:
+
+    python -m benchmarks.auth --sessions 100 --iterations 20000
+
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from conduit.api.dependencies import decode_token
+from conduit.core.security import TOKEN_CACHE
+from conduit.core.settings import get_settings_cached
+from conduit.services.auth import create_access_token
+
+SETTINGS = get_settings_cached()
+
+
+def make_tokens(count: int) -> List[str]:
+    return [
+        create_access_token(
+            subject=str(n),
+            expires_minutes=SETTINGS.access_token_expire_minutes,
+            secret_key=SETTINGS.secret_key,
+            algorithm=SETTINGS.algorithm,
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+def measure(tokens: List[str], iterations: int, max_entries: int) -> Dict[str, float]:
+    TOKEN_CACHE.max_entries = max_entries
+    TOKEN_CACHE.clear()
+    for token in tokens:
+        decode_token(token=token, settings=SETTINGS)
+    start = time.perf_counter()
+    for n in range(iterations):
+        decode_token(token=tokens[n % len(tokens)], settings=SETTINGS)
+    elapsed = time.perf_counter() - start
+    return {"per_request_us": elapsed / iterations * 1e6}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.sessions)
+    for name, max_entries in (("uncached", 0), ("cached", SETTINGS.token_cache_max_entries)):
+        result = measure(tokens, args.iterations, max_entries)
+        print(f"{name:>10}: " + ", ".join(f"{key}={value:.2f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
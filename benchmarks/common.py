@@ -0,0 +1,48 @@
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import text
+
+from conduit.core.settings import get_settings_cached
+
+SEED = """
+INSERT INTO "user" (username, email, hashed_password, bio)
+SELECT 'bench' || n, 'bench' || n || '@example.com', repeat('x', 60), repeat('bio ', 40)
+FROM generate_series(1, :users) AS n;
+INSERT INTO tag (name) SELECT 'benchtag' || n FROM generate_series(1, 200) AS n
+ON CONFLICT DO NOTHING;
+INSERT INTO article (slug, title, description, body, author_id, created_at, updated_at)
+SELECT 'bench-' || n, 'title ' || n, 'description ' || n, repeat('body text ', :body_words),
+       (SELECT min(id) FROM "user") + n % :users,
+       now() - n * interval '1 minute', now() - n * interval '1 minute'
+FROM generate_series(1, :articles) AS n;
+INSERT INTO articletag (article_id, tag_id)
+SELECT article.id, tag.id FROM article JOIN tag ON tag.id % 50 = article.id % 50
+WHERE article.slug LIKE 'bench-%';
+UPDATE article SET tag_names = ARRAY(
+    SELECT tag.name FROM articletag JOIN tag ON tag.id = articletag.tag_id
+    WHERE articletag.article_id = article.id ORDER BY tag.name COLLATE "C"
+)
+WHERE article.slug LIKE 'bench-%';
+"""
+
+
+def create_engine() -> AsyncEngine:
+    settings = get_settings_cached()
+    return create_async_engine(settings.database_uri, poolclass=pool.NullPool)
+
+
+async def seed(
+    engine: AsyncEngine,
+    *,
+    users: int = 500,
+    articles: int = 20000,
+    body_words: int = 2000,
+) -> None:
+    async with engine.begin() as connection:
+        for statement in SEED.split(";"):
+            if statement.strip():
+                await connection.execute(
+                    text(statement),
+                    {"users": users, "articles": articles, "body_words": body_words},
+                )
+        await connection.execute(text("ANALYZE"))
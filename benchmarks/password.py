@@ -0,0 +1,84 @@
+"""Measure how a burst of password checks affects concurrent read traffic.
+
+No database is needed. A reader coroutine stands in for article requests by
+sleeping 1 ms in a loop and recording how late it wakes up, while a burst of
+logins verifies bcrypt hashes either inline or through the hashing pool:
+
+    python -m benchmarks.password --logins 16
+
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from conduit.exceptions import PasswordHasherBusyException
+from conduit.services import password as password_service
+
+PASSWORD = "correct horse battery staple"
+
+
+async def verify_inline(hashed_password: str) -> bool:
+    return password_service.verify_password(PASSWORD, hashed_password)
+
+
+async def verify_pooled(hashed_password: str) -> bool:
+    return await password_service.verify_password_async(PASSWORD, hashed_password)
+
+
+async def reader(delays: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(
+    verify: Callable[[str], Awaitable[bool]], hashed_password: str, logins: int
+) -> Dict[str, float]:
+    delays: List[float] = []
+    stop = asyncio.Event()
+    reader_task = asyncio.create_task(reader(delays, stop))
+    await asyncio.sleep(0.01)
+    rejected = 0
+
+    async def login() -> None:
+        nonlocal rejected
+        try:
+            assert await verify(hashed_password)
+        except PasswordHasherBusyException:
+            rejected += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await reader_task
+    delays.sort()
+    return {
+        "burst_s": elapsed,
+        "rejected": rejected,
+        "reader_p50_ms": statistics.median(delays) * 1e3,
+        "reader_p99_ms": delays[int(len(delays) * 0.99)] * 1e3,
+        "reader_max_ms": delays[-1] * 1e3,
+    }
+
+
+async def run(logins: int) -> None:
+    hashed_password = password_service.get_password_hash(PASSWORD)
+    for name, verify in (("inline", verify_inline), ("pooled", verify_pooled)):
+        result = await measure(verify, hashed_password, logins)
+        print(f"{name:>8}: " + ", ".join(f"{key}={value:.2f}" for key, value in result.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Compare per-row serialization cost of article listings.
+
+No database is needed; rows are synthetic tuples shaped like the listing
+query's result:
+
+    python -m benchmarks.serialization --rows 20 --iterations 2000
+
+"""
+
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from conduit.api.responses import (
+    ArticleFragment,
+    render_article_fragment,
+    render_articles,
+    render_author_fragment,
+)
+from conduit.schemas.article import ArticleData, ArticlesResponse
+from conduit.schemas.profile import ProfileData
+from conduit.services.viewer import ViewerState
+
+ListingRow = namedtuple(
+    "ListingRow",
+    [
+        "id",
+        "author_id",
+        "slug",
+        "title",
+        "description",
+        "created_at",
+        "updated_at",
+        "favorites_count",
+        "tag_names",
+        "username",
+        "bio",
+        "image",
+        "following",
+        "favorited",
+    ],
+)
+
+RESPONSE_MODEL = TypeAdapter(ArticlesResponse)
+
+
+def make_rows(count: int, authors: int) -> List[ListingRow]:
+    now = datetime(2026, 1, 1)
+    return [
+        ListingRow(
+            id=n,
+            author_id=n % authors,
+            slug=f"article-{n}",
+            title=f"Article {n}",
+            description="description " * 8,
+            created_at=now - timedelta(minutes=n),
+            updated_at=now - timedelta(minutes=n),
+            favorites_count=n % 17,
+            tag_names=sorted(f"tag{(n * k) % 50}" for k in range(1, 4)),
+            username=f"author{n % authors}",
+            bio="bio " * 20,
+            image=None,
+            following=(n % authors) % 2 == 0,
+            favorited=n % 5 == 0,
+        )
+        for n in range(count)
+    ]
+
+
+def models_then_response_model(rows: List[ListingRow]) -> bytes:
+    # What the routes did before: build ArticleData/ProfileData per row, then
+    # let FastAPI validate against response_model and encode the result.
+    response = ArticlesResponse(
+        articles=[
+            ArticleData(
+                slug=row.slug,
+                title=row.title,
+                description=row.description,
+                author=ProfileData(
+                    username=row.username,
+                    bio=row.bio,
+                    image=row.image,
+                    following=row.following,
+                ),
+                tag_list=row.tag_names,
+                favorited=row.favorited,
+                favorites_count=row.favorites_count,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ],
+        articles_count=len(rows),
+        has_more=False,
+    )
+    validated = RESPONSE_MODEL.validate_python(jsonable_encoder(response, by_alias=False))
+    content = RESPONSE_MODEL.dump_python(validated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def viewer_state(rows: List[ListingRow]) -> ViewerState:
+    return ViewerState(
+        following={row.author_id for row in rows if row.following},
+        favorited={row.id for row in rows if row.favorited},
+    )
+
+
+def assemble(
+    rows: List[ListingRow],
+    articles: Dict[int, ArticleFragment],
+    authors: Dict[int, bytes],
+) -> bytes:
+    return render_articles(
+        rows=rows,
+        articles=articles,
+        authors=authors,
+        articles_count=len(rows),
+        has_more=False,
+        next_cursor=None,
+        viewer=viewer_state(rows),
+    )
+
+
+def assembler(rows: List[ListingRow]) -> bytes:
+    # Every fragment rendered for this response: a cold fragment cache.
+    articles = {row.id: render_article_fragment(row=row) for row in rows}
+    authors = {row.author_id: render_author_fragment(row=row) for row in rows}
+    return assemble(rows, articles, authors)
+
+
+def cached_fragments(rows: List[ListingRow]) -> Callable[[List[ListingRow]], bytes]:
+    # Fragments rendered once up front, as a warm fragment cache serves them.
+    articles = {row.id: render_article_fragment(row=row) for row in rows}
+    authors = {row.author_id: render_author_fragment(row=row) for row in rows}
+    return lambda rows: assemble(rows, articles, authors)
+
+
+def measure(
+    render: Callable[[List[ListingRow]], bytes], rows: List[ListingRow], iterations: int
+) -> Dict[str, float]:
+    render(rows)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render(rows)
+    elapsed = time.perf_counter() - start
+    return {
+        "per_response_us": elapsed / iterations * 1e6,
+        "per_row_us": elapsed / iterations / len(rows) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--authors", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.authors)
+    renderers: Dict[str, Callable[[List[ListingRow]], Any]] = {
+        "models": models_then_response_model,
+        "assembler": assembler,
+        "fragments": cached_fragments(rows),
+    }
+    expected = json.loads(models_then_response_model(rows))
+    assert all(json.loads(render(rows)) == expected for render in renderers.values())
+    for name, render in renderers.items():
+        result = measure(render, rows, args.iterations)
+        print(f"{name:>10}: " + ", ".join(f"{key}={value:.2f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
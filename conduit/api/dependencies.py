@@ -1,14 +1,23 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any, Tuple
 
-from fastapi import Depends
+from fastapi import Depends, Header, Query, Request
 from jose import ExpiredSignatureError, JWTError, jwt
 from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from conduit.core.database import get_db
-from conduit.core.security import HTTPTokenHeader
+from conduit.core.database import (
+    READ_YOUR_WRITES_COOKIE,
+    AsyncSessionLocal,
+    get_db,
+    get_read_engine,
+)
+from conduit.core.rate_limit import AUTH_RATE_LIMITER, client_ip
+from conduit.core.security import TOKEN_CACHE, HTTPTokenHeader
 from conduit.core.settings import Settings, get_settings_cached
+from conduit.core.utils.cursor import decode_cursor
 from conduit.exceptions import (
+    ArticleCursorInvalidException,
     InvalidCredentialsException,
     TokenExpiredException,
     TokenInvalidException,
@@ -16,6 +25,7 @@ from conduit.exceptions import (
 )
 from conduit.models import User
 from conduit.schemas.token import TokenPayload
+from conduit.schemas.user import UserLoginRequest, UserRegistrationRequest
 from conduit.services import user as user_service
 
 bearer = HTTPTokenHeader(raise_error=True, name="Authorization")
@@ -35,29 +45,83 @@ SettingsDep = Annotated[
 ]
 SessionDB = Annotated[
     AsyncSession,
-    Depends(get_db),
+    Depends(get_db, scope="function"),
+]
+IfNoneMatch = Annotated[
+    str | None,
+    Header(),
+]
+AcceptHeader = Annotated[
+    str | None,
+    Header(alias="Accept"),
+]
+AuthorizationHeader = Annotated[
+    str | None,
+    Header(alias="Authorization"),
 ]
 
 
-async def get_current_user(
-    session: SessionDB,
-    token: Token,
-    settings: SettingsDep,
+def decode_token(*, token: str, settings: Settings) -> TokenPayload:
+    token_data = TOKEN_CACHE.get(token)
+    if token_data is not None:
+        return token_data
+    payload = jwt.decode(
+        token=token,
+        key=settings.secret_key,
+        algorithms=[settings.algorithm],
+    )
+    token_data = TokenPayload(**payload)
+    TOKEN_CACHE.set(token, token_data)
+    return token_data
+
+
+def decode_request_token(*, request: Request, token: str, settings: Settings) -> TokenPayload:
+    # Both the read session and the current user need the payload. The outcome
+    # is kept on the request, failures included, so each request is decoded
+    # and counted against the token cache once.
+    decoded = getattr(request.state, "token", None)
+    if decoded is None or decoded[0] != token:
+        outcome: TokenPayload | Exception
+        try:
+            outcome = decode_token(token=token, settings=settings)
+        except (JWTError, ExpiredSignatureError, ValidationError) as ex:
+            outcome = ex
+        decoded = request.state.token = (token, outcome)
+    if isinstance(decoded[1], TokenPayload):
+        return decoded[1]
+    raise decoded[1]
+
+
+async def get_db_readonly(request: Request) -> Any:
+    # GET routes read from a caught-up replica unless the client wrote
+    # recently. The current user is still loaded through the primary session.
+    pinned_until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    async with AsyncSessionLocal(bind=get_read_engine(pinned_until=pinned_until)) as session:
+        yield session
+
+
+SessionReadOnly = Annotated[
+    AsyncSession,
+    Depends(get_db_readonly, scope="function"),
+]
+
+
+async def _load_current_user(
+    *,
+    request: Request,
+    session: AsyncSession,
+    token: str,
+    settings: Settings,
 ) -> User:
     try:
-        payload = jwt.decode(
-            token=token,
-            key=settings.secret_key,
-            algorithms=[settings.algorithm],
-        )
-        token_data = TokenPayload(**payload)
+        token_data = decode_request_token(request=request, token=token, settings=settings)
     except JWTError as ex:
         raise TokenInvalidException() from ex
     except ExpiredSignatureError as ex:
         raise TokenExpiredException() from ex
     except ValidationError as ex:
         raise InvalidCredentialsException() from ex
-    user_db = await user_service.get_user_by_id(
+    user_db = await user_service.get_current_user_by_id(
         session=session,
         user_id=token_data.sub,
     )
@@ -66,27 +130,98 @@ async def get_current_user(
     return user_db
 
 
-async def get_current_user_optional(
-    session: SessionDB,
-    token: TokenOptional,
-    settings: SettingsDep,
+async def _load_current_user_optional(
+    *,
+    request: Request,
+    session: AsyncSession,
+    token: str | None,
+    settings: Settings,
 ) -> User | None:
     if not token:
         return None
     try:
-        payload = jwt.decode(
-            token=token,
-            key=settings.secret_key,
-            algorithms=[settings.algorithm],
-        )
-        token_data = TokenPayload(**payload)
+        token_data = decode_request_token(request=request, token=token, settings=settings)
     except (JWTError, ExpiredSignatureError, ValidationError):
         return None
-    user_db = await user_service.get_user_by_id(
+    return await user_service.get_current_user_by_id(
         session=session,
         user_id=token_data.sub,
     )
-    return user_db
+
+
+async def get_current_user(
+    request: Request,
+    session: SessionDB,
+    token: Token,
+    settings: SettingsDep,
+) -> User:
+    # GET routes load the current user through the primary session as well. It
+    # only connects on a user-cache miss, a token issued moments ago always
+    # resolves, and the cache never holds a row read from a replica.
+    return await _load_current_user(
+        request=request,
+        session=session,
+        token=token,
+        settings=settings,
+    )
+
+
+async def get_current_user_optional(
+    request: Request,
+    session: SessionDB,
+    token: TokenOptional,
+    settings: SettingsDep,
+) -> User | None:
+    return await _load_current_user_optional(
+        request=request,
+        session=session,
+        token=token,
+        settings=settings,
+    )
+
+
+async def limit_login_attempts(
+    request: Request,
+    user_request: UserLoginRequest,
+) -> None:
+    await AUTH_RATE_LIMITER.check(
+        client_ip=client_ip(request),
+        email=user_request.user.email,
+    )
+
+
+async def limit_registration_attempts(
+    request: Request,
+    user_request: UserRegistrationRequest,
+) -> None:
+    await AUTH_RATE_LIMITER.check(
+        client_ip=client_ip(request),
+        email=user_request.user.email,
+    )
+
+
+def _parse_cursor(cursor: str | None, sort_type: type) -> Tuple[Any, int] | None:
+    if not cursor:
+        return None
+    try:
+        sort_key, article_id = decode_cursor(cursor)
+    except ValueError as ex:
+        raise ArticleCursorInvalidException() from ex
+    if not isinstance(sort_key, sort_type):
+        raise ArticleCursorInvalidException()
+    return sort_key, article_id
+
+
+async def get_article_cursor(
+    cursor: str | None = Query(None),
+) -> Tuple[datetime, int] | None:
+    return _parse_cursor(cursor, datetime)
+
+
+async def get_search_cursor(
+    cursor: str | None = Query(None),
+) -> Tuple[float, int] | None:
+    return _parse_cursor(cursor, float)
 
 
 CurrentUser = Annotated[
@@ -97,3 +232,11 @@ CurrentOptionalUser = Annotated[
     User | None,
     Depends(get_current_user_optional),
 ]
+ArticleCursor = Annotated[
+    Tuple[datetime, int] | None,
+    Depends(get_article_cursor),
+]
+SearchCursor = Annotated[
+    Tuple[float, int] | None,
+    Depends(get_search_cursor),
+]
@@ -0,0 +1,188 @@
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Tuple
+
+from fastapi import Response, status
+from pydantic_core import to_json
+
+from conduit.models import Article, Comment, User
+from conduit.schemas.utils import format_datetime
+from conduit.services.viewer import ViewerState
+
+# Routes render service rows straight to JSON bytes in the camelCase shape of
+# the schemas in conduit.schemas, which remain the documented response_model.
+# Returning a Response skips FastAPI's second validation and serialization.
+
+JSONDict = Dict[str, Any]
+
+
+def json_response(
+    content: bytes,
+    *,
+    status_code: int = status.HTTP_200_OK,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def profile_data(*, user: User, following: bool) -> JSONDict:
+    return {
+        "username": user.username,
+        "bio": user.bio,
+        "image": user.image,
+        "following": following,
+    }
+
+
+class ArticleFragment(NamedTuple):
+    # A listing item's article fields, split around the viewer's "favorited".
+    head: bytes
+    tail: bytes
+
+
+JSON_BOOLEANS = {True: b"true", False: b"false"}
+
+
+def article_fragment_version(row: Any) -> Hashable:
+    # Retagging and favoriting leave updated_at alone, so they key the
+    # fragment as well.
+    return (row.updated_at, row.favorites_count, tuple(row.tag_names))
+
+
+def render_article_fragment(*, row: Any) -> ArticleFragment:
+    fields = to_json(
+        {
+            "title": row.title,
+            "slug": row.slug,
+            "description": row.description,
+            "createdAt": format_datetime(row.created_at),
+            "updatedAt": format_datetime(row.updated_at),
+            "tagList": row.tag_names,
+        }
+    )
+    return ArticleFragment(
+        head=b"," + fields[1:-1] + b',"favorited":',
+        tail=b',"favoritesCount":' + to_json(row.favorites_count) + b"}",
+    )
+
+
+def render_author_fragment(*, row: Any) -> bytes:
+    # The opening of a listing item, up to the viewer's "following".
+    author = to_json({"username": row.username, "bio": row.bio, "image": row.image})
+    return b'{"author":' + author[:-1] + b',"following":'
+
+
+def _list_item(
+    *,
+    row: Any,
+    article: ArticleFragment,
+    author: bytes,
+    viewer: ViewerState,
+) -> bytes:
+    return b"".join(
+        (
+            author,
+            JSON_BOOLEANS[row.author_id in viewer.following],
+            b"}",
+            article.head,
+            JSON_BOOLEANS[row.id in viewer.favorited],
+            article.tail,
+        )
+    )
+
+
+def render_articles(
+    *,
+    rows: Iterable[Any],
+    articles: Mapping[int, ArticleFragment],
+    authors: Mapping[int, bytes],
+    articles_count: int | None,
+    has_more: bool,
+    next_cursor: str | None,
+    viewer: ViewerState,
+) -> bytes:
+    # Listings are spliced together from per-article and per-author fragments
+    # that are shared by every page and every viewer; only the viewer's flags
+    # are filled in per request.
+    items = b",".join(
+        _list_item(row=row, article=articles[row.id], author=authors[row.author_id], viewer=viewer)
+        for row in rows
+    )
+    trailer = to_json(
+        {
+            "articlesCount": articles_count,
+            "hasMore": has_more,
+            "nextCursor": next_cursor,
+        }
+    )
+    return b'{"articles":[' + items + b"]," + trailer[1:]
+
+
+def render_article_line(*, row: Any, viewer: ViewerState) -> bytes:
+    article = render_article_fragment(row=row)
+    author = render_author_fragment(row=row)
+    return _list_item(row=row, article=article, author=author, viewer=viewer) + b"\n"
+
+
+def render_article(
+    *,
+    article: Article,
+    author: User,
+    following: bool,
+    favorited: bool,
+    favorites_count: int,
+    tag_names: List[str],
+) -> bytes:
+    data = {
+        "author": profile_data(user=author, following=following),
+        "title": article.title,
+        "slug": article.slug,
+        "description": article.description,
+        "createdAt": format_datetime(article.created_at),  # type: ignore[arg-type]
+        "updatedAt": format_datetime(article.updated_at),  # type: ignore[arg-type]
+        "tagList": tag_names,
+        "favorited": favorited,
+        "favoritesCount": favorites_count,
+        "body": article.body,
+    }
+    return to_json({"article": data})
+
+
+def _comment_data(*, comment: Comment, author: JSONDict) -> JSONDict:
+    return {
+        "id": comment.id,
+        "body": comment.body,
+        "author": author,
+        "createdAt": format_datetime(comment.created_at),  # type: ignore[arg-type]
+        "updatedAt": format_datetime(comment.updated_at),  # type: ignore[arg-type]
+    }
+
+
+def render_comment(*, comment: Comment, author: User, following: bool) -> bytes:
+    author_data = profile_data(user=author, following=following)
+    return to_json({"comment": _comment_data(comment=comment, author=author_data)})
+
+
+def render_comments(*, rows: Iterable[Tuple[Comment, User]], viewer: ViewerState) -> bytes:
+    authors: Dict[str, JSONDict] = {}
+    comments = []
+    for comment, user in rows:
+        author = authors.get(user.username)
+        if author is None:
+            author = authors[user.username] = profile_data(
+                user=user,
+                following=user.id in viewer.following,
+            )
+        comments.append(_comment_data(comment=comment, author=author))
+    return to_json({"comments": comments})
+
+
+def render_profile(*, user: User, following: bool) -> bytes:
+    return to_json({"profile": profile_data(user=user, following=following)})
+
+
+def render_page_trailer(*, has_more: bool, next_cursor: str | None) -> bytes:
+    return to_json({"hasMore": has_more, "nextCursor": next_cursor}) + b"\n"
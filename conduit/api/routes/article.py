@@ -1,30 +1,195 @@
 import logging
+from typing import Any, AsyncIterator, Dict, Sequence, Tuple
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import conduit.services.article as article_service
 import conduit.services.favorite as favorite_service
 import conduit.services.tag as tag_service
-from conduit.api.dependencies import CurrentOptionalUser, CurrentUser, SessionDB
+import conduit.services.viewer as viewer_service
+from conduit.api.dependencies import (
+    AcceptHeader,
+    ArticleCursor,
+    AuthorizationHeader,
+    CurrentOptionalUser,
+    CurrentUser,
+    IfNoneMatch,
+    SearchCursor,
+    SessionDB,
+    SessionReadOnly,
+    SettingsDep,
+)
+from conduit.api.responses import (
+    ArticleFragment,
+    article_fragment_version,
+    json_response,
+    render_article,
+    render_article_fragment,
+    render_article_line,
+    render_articles,
+    render_author_fragment,
+    render_page_trailer,
+)
+from conduit.core.cache import (
+    ARTICLE_FRAGMENTS,
+    ARTICLES,
+    AUTHOR_FRAGMENTS,
+    RESPONSE_CACHE,
+    CachedResponse,
+)
+from conduit.core.database import AsyncSessionLocal
+from conduit.core.settings import get_settings_cached
+from conduit.core.utils.cursor import encode_cursor
+from conduit.core.utils.etag import etag_matches, make_etag, not_modified
 from conduit.exceptions import (
-    ArticleAlreadyFavoritedException,
+    ArticleLimitTooLargeException,
     ArticleNotAuthorException,
-    ArticleNotFavoritedException,
     ArticleNotFoundException,
 )
+from conduit.models import User
 from conduit.schemas.article import (
-    ArticleData,
-    ArticleDataComplete,
     ArticleRegisterRequest,
     ArticleResponse,
     ArticlesResponse,
     ArticleUpdateRequest,
 )
-from conduit.schemas.profile import ProfileData
+from conduit.services.viewer import ViewerState
 
 router = APIRouter()
 log = logging.getLogger("conduit.api.articles")
 
+MAX_LIMIT = get_settings_cached().articles_max_limit
+STREAM_MAX_LIMIT = get_settings_cached().articles_stream_max_limit
+NDJSON = "application/x-ndjson"
+
+
+def _next_cursor(*, response: Sequence[Row[Any]], has_more: bool) -> str | None:
+    if not has_more:
+        return None
+    return encode_cursor(response[-1].sort_key, response[-1].id)
+
+
+async def _get_viewer_state(
+    *,
+    session: AsyncSession,
+    current_user: User | None,
+    rows: Sequence[Any],
+) -> ViewerState:
+    return await viewer_service.get_viewer_state(
+        session=session,
+        current_user_id=current_user.id if current_user else None,
+        author_ids=(row.author_id for row in rows),
+        article_ids=(row.id for row in rows),
+    )
+
+
+async def _stream_articles(
+    *,
+    bind: AsyncEngine,
+    current_user: User | None,
+    limit: int,
+    **filters: Any,
+) -> AsyncIterator[bytes]:
+    # The request's session may be gone by the time the body is sent, so the
+    # stream owns a session on the same server. Articles go out one per line
+    # as batches arrive, followed by a line with the paging state.
+    sent = 0
+    last_row = None
+    has_more = False
+    async with AsyncSessionLocal(bind=bind) as session:
+        async for rows in article_service.stream_articles_with_filters(
+            session=session,
+            limit=limit,
+            **filters,
+        ):
+            if len(rows) > limit - sent:
+                has_more = True
+                rows = rows[: limit - sent]
+            if not rows:
+                continue
+            viewer = await _get_viewer_state(session=session, current_user=current_user, rows=rows)
+            for row in rows:
+                yield render_article_line(row=row, viewer=viewer)
+            sent += len(rows)
+            last_row = rows[-1]
+    next_cursor = _next_cursor(response=[last_row], has_more=has_more) if last_row else None
+    yield render_page_trailer(has_more=has_more, next_cursor=next_cursor)
+
+
+async def _render_listing(
+    *,
+    session: AsyncSession,
+    rows: Sequence[Row[Any]],
+    articles_count: int | None,
+    has_more: bool,
+    viewer: ViewerState,
+) -> bytes:
+    # Listings read only the page's versions. Fragments rendered for earlier
+    # requests are reused, and only articles without a current one are loaded.
+    articles: Dict[int, ArticleFragment] = {}
+    authors: Dict[int, bytes] = {}
+    missing = set()
+    for row in rows:
+        article = ARTICLE_FRAGMENTS.get(row.id, article_fragment_version(row))
+        if article is None:
+            missing.add(row.id)
+        else:
+            articles[row.id] = article
+        if row.author_id in authors:
+            continue
+        author = AUTHOR_FRAGMENTS.get(row.author_id, row.author_updated_at)
+        if author is None:
+            missing.add(row.id)
+        else:
+            authors[row.author_id] = author
+    if missing:
+        for row in await article_service.get_article_list_rows_by_ids(
+            session=session,
+            article_ids=missing,
+        ):
+            articles[row.id] = render_article_fragment(row=row)
+            ARTICLE_FRAGMENTS.set(row.id, article_fragment_version(row), articles[row.id])
+            authors[row.author_id] = render_author_fragment(row=row)
+            AUTHOR_FRAGMENTS.set(row.author_id, row.author_updated_at, authors[row.author_id])
+    next_cursor = _next_cursor(response=rows, has_more=has_more)
+    # Articles deleted since the page was read are left out.
+    rows = [row for row in rows if row.id in articles and row.author_id in authors]
+    return render_articles(
+        rows=rows,
+        articles=articles,
+        authors=authors,
+        articles_count=articles_count,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        viewer=viewer,
+    )
+
+
+def _article_version(row: Any, viewer: ViewerState) -> Tuple[Any, ...]:
+    return (
+        row.id,
+        row.updated_at,
+        row.favorites_count,
+        row.tag_names,
+        row.author_updated_at,
+        row.author_id in viewer.following,
+        row.id in viewer.favorited,
+    )
+
+
+def _listing_etag(
+    *,
+    rows: Sequence[Row[Any]],
+    articles_count: int | None,
+    has_more: bool,
+    viewer: ViewerState,
+) -> str:
+    return make_etag(articles_count, has_more, *(_article_version(row, viewer) for row in rows))
+
 
 @router.get(
     path="/articles",
@@ -34,58 +199,93 @@ log = logging.getLogger("conduit.api.articles")
     status_code=status.HTTP_200_OK,
 )
 async def list_articles(
-    session: SessionDB,
+    session: SessionReadOnly,
     current_user: CurrentOptionalUser,
+    cursor: ArticleCursor,
+    if_none_match: IfNoneMatch = None,
+    accept: AcceptHeader = None,
+    authorization: AuthorizationHeader = None,
     tag: str | None = Query(None),
     author: str | None = Query(None),
     favorited: str | None = Query(None),
-    limit: int = Query(20, ge=1),
+    # The cap depends on the Accept header, so it is checked below and only
+    # described here; a schema maximum would advertise the stream cap to JSON.
+    limit: int = Query(
+        20,
+        ge=1,
+        description=(
+            f"Page size: at most {MAX_LIMIT} for JSON,"
+            f" or {STREAM_MAX_LIMIT} when streaming with `Accept: {NDJSON}`."
+        ),
+    ),
     offset: int = Query(0, ge=0),
-) -> ArticlesResponse:
-    response = await article_service.get_articles_with_filters(
+    count: bool = Query(True),
+) -> Response:
+    stream = bool(accept and NDJSON in accept)
+    if limit > (STREAM_MAX_LIMIT if stream else MAX_LIMIT):
+        raise ArticleLimitTooLargeException()
+    if stream:
+        return StreamingResponse(
+            _stream_articles(
+                bind=session.bind,
+                current_user=current_user,
+                tag=tag,
+                author=author,
+                favorited=favorited,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            ),
+            media_type=NDJSON,
+        )
+    # Anonymous listings are the same for every caller, so they are served
+    # from the response cache until a write invalidates them. Any request
+    # carrying credentials, valid or not, takes the uncached path.
+    anonymous = authorization is None
+    cache_key = (tag, author, favorited, limit, offset, cursor, count)
+    generation = RESPONSE_CACHE.generation(ARTICLES)
+    if anonymous:
+        cached = RESPONSE_CACHE.get(ARTICLES, cache_key)
+        if cached is not None:
+            if cached.etag and etag_matches(if_none_match, cached.etag):
+                return not_modified(cached.etag)
+            headers = {"ETag": cached.etag} if cached.etag else None
+            return json_response(cached.content, headers=headers)
+    versions, articles_count, has_more = await article_service.get_articles_with_filters(
         session=session,
-        current_user_id=current_user.id if current_user else None,
         tag=tag,
         author=author,
         favorited=favorited,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        with_count=count,
+        versions_only=True,
     )
-    article_count = await article_service.count_articles_with_filters(
-        session=session,
-        tag=tag,
-        author=author,
-        favorited=favorited,
+    viewer = await _get_viewer_state(session=session, current_user=current_user, rows=versions)
+    etag = _listing_etag(
+        rows=versions,
+        articles_count=articles_count,
+        has_more=has_more,
+        viewer=viewer,
     )
-    return ArticlesResponse(
-        articles=[
-            ArticleData(
-                slug=article_db.slug,
-                title=article_db.title,
-                description=article_db.description,
-                author=ProfileData(
-                    username=user_db.username,
-                    bio=user_db.bio,
-                    image=user_db.image,
-                    following=following,
-                ),
-                tag_list=sorted(tags_string.split(",")) if tags_string else [],
-                favorited=favorited,
-                favorites_count=favorites_count,
-                created_at=article_db.created_at,
-                updated_at=article_db.updated_at,
-            )
-            for (
-                article_db,
-                user_db,
-                following,
-                favorites_count,
-                favorited,
-                tags_string,
-            ) in response
-        ],
-        articles_count=article_count,
+    if if_none_match and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    content = await _render_listing(
+        session=session,
+        rows=versions,
+        articles_count=articles_count,
+        has_more=has_more,
+        viewer=viewer,
     )
+    if anonymous:
+        RESPONSE_CACHE.set(
+            ARTICLES,
+            cache_key,
+            CachedResponse(content=content, etag=etag),
+            generation=generation,
+        )
+    return json_response(content, headers={"ETag": etag})
 
 
 @router.get(
@@ -96,50 +296,71 @@ async def list_articles(
     status_code=status.HTTP_200_OK,
 )
 async def feed_articles(
-    session: SessionDB,
+    session: SessionReadOnly,
     current_user: CurrentUser,
-    limit: int = Query(20, ge=1),
+    cursor: ArticleCursor,
+    limit: int = Query(20, ge=1, description=f"Page size: at most {MAX_LIMIT}."),
     offset: int = Query(0, ge=0),
-) -> ArticlesResponse:
-    response = await article_service.get_articles_from_followed_authors(
+    count: bool = Query(True),
+) -> Response:
+    if limit > MAX_LIMIT:
+        raise ArticleLimitTooLargeException()
+    response, articles_count, has_more = await article_service.get_articles_from_followed_authors(
         session=session,
         current_user_id=current_user.id,  # type: ignore[arg-type]
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        with_count=count,
+        versions_only=True,
     )
-    count = await article_service.count_articles_from_followed_authors(
+    viewer = await _get_viewer_state(session=session, current_user=current_user, rows=response)
+    content = await _render_listing(
         session=session,
-        current_user_id=current_user.id,  # type: ignore[arg-type]
+        rows=response,
+        articles_count=articles_count,
+        has_more=has_more,
+        viewer=viewer,
     )
-    return ArticlesResponse(
-        articles=[
-            ArticleData(
-                slug=article_db.slug,
-                title=article_db.title,
-                description=article_db.description,
-                author=ProfileData(
-                    username=user_db.username,
-                    bio=user_db.bio,
-                    image=user_db.image,
-                    following=following,
-                ),
-                tag_list=sorted(tags_string.split(",")) if tags_string else [],
-                favorited=favorited,
-                favorites_count=favorites_count,
-                created_at=article_db.created_at,
-                updated_at=article_db.updated_at,
-            )
-            for (
-                article_db,
-                user_db,
-                following,
-                favorites_count,
-                favorited,
-                tags_string,
-            ) in response
-        ],
-        articles_count=count,
+    return json_response(content)
+
+
+@router.get(
+    path="/articles/search",
+    tags=["articles"],
+    response_model=ArticlesResponse,
+    summary="Full-text search over articles, best matches first.",
+    status_code=status.HTTP_200_OK,
+)
+async def search_articles(
+    session: SessionReadOnly,
+    current_user: CurrentOptionalUser,
+    cursor: SearchCursor,
+    q: str = Query(min_length=1),
+    limit: int = Query(20, ge=1, description=f"Page size: at most {MAX_LIMIT}."),
+    offset: int = Query(0, ge=0),
+    count: bool = Query(True),
+) -> Response:
+    if limit > MAX_LIMIT:
+        raise ArticleLimitTooLargeException()
+    response, articles_count, has_more = await article_service.search_articles(
+        session=session,
+        search=q,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        with_count=count,
+        versions_only=True,
     )
+    viewer = await _get_viewer_state(session=session, current_user=current_user, rows=response)
+    content = await _render_listing(
+        session=session,
+        rows=response,
+        articles_count=articles_count,
+        has_more=has_more,
+        viewer=viewer,
+    )
+    return json_response(content)
 
 
 @router.post(
@@ -153,37 +374,29 @@ async def create_article(
     session: SessionDB,
     current_user: CurrentUser,
     article_request: ArticleRegisterRequest,
-) -> ArticleResponse:
+    settings: SettingsDep,
+) -> Response:
     article = article_request.article
     article_db = await article_service.create_article(
         session=session,
         request=article,
         author_id=current_user.id,  # type: ignore[arg-type]
+        fanout_max_followers=settings.feed_fanout_max_followers,
     )
-    if article.tag_list:
-        await tag_service.create_tags_for_article(
-            session=session,
-            article_id=article_db.id,  # type: ignore[arg-type]
-            tag_names=article.tag_list,
-        )
-    return ArticleResponse(
-        article=ArticleDataComplete(
-            slug=article_db.slug,
-            title=article_db.title,
-            description=article_db.description,
-            body=article_db.body,
-            author=ProfileData(
-                username=current_user.username,
-                bio=current_user.bio,
-                image=current_user.image,
-            ),
-            tag_list=(article.tag_list if article.tag_list else []),
-            favorited=False,
-            favorites_count=0,
-            created_at=article_db.created_at,
-            updated_at=article_db.updated_at,
-        )
+    tags = await tag_service.create_tags_for_article(
+        session=session,
+        article_id=article_db.id,  # type: ignore[arg-type]
+        tag_names=article.tag_list or [],
+    )
+    content = render_article(
+        article=article_db,
+        author=current_user,
+        following=False,
+        favorited=False,
+        favorites_count=0,
+        tag_names=tags,
     )
+    return json_response(content, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -195,43 +408,59 @@ async def create_article(
 )
 async def get_article(
     slug: str,
-    session: SessionDB,
+    session: SessionReadOnly,
     current_user: CurrentOptionalUser,
-) -> ArticleResponse:
-    response = await article_service.get_article_author_tags_favorite(
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    # Only a conditional request pays for the version probe. On a mismatch its
+    # viewer state is reused, so the miss path adds just the probe itself.
+    viewer: ViewerState | None = None
+    if if_none_match:
+        version = await article_service.get_article_version(
+            session=session,
+            article_slug=slug,
+        )
+        if not version:
+            raise ArticleNotFoundException()
+        viewer = await _get_viewer_state(session=session, current_user=current_user, rows=[version])
+        etag = make_etag(_article_version(version, viewer))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    response = await article_service.get_article_and_author(
         session=session,
         article_slug=slug,
-        current_user_id=current_user.id if current_user else 0,
     )
     if not response:
         raise ArticleNotFoundException()
-    (
-        article_db,
-        author_db,
-        following,
-        favorites_count,
-        favorited,
-        tags_string,
-    ) = response
-    return ArticleResponse(
-        article=ArticleDataComplete(
-            slug=article_db.slug,
-            title=article_db.title,
-            description=article_db.description,
-            body=article_db.body,
-            author=ProfileData(
-                username=author_db.username,
-                bio=author_db.bio,
-                image=author_db.image,
-                following=following,
-            ),
-            tag_list=tags_string.split(",") if tags_string else [],
-            favorited=favorited,
-            favorites_count=favorites_count,
-            created_at=article_db.created_at,
-            updated_at=article_db.updated_at,
+    article_db, author_db = response
+    if viewer is None:
+        viewer = await _get_viewer_state(
+            session=session,
+            current_user=current_user,
+            rows=[article_db],
         )
+    following = article_db.author_id in viewer.following
+    favorited = article_db.id in viewer.favorited
+    etag = make_etag(
+        (
+            article_db.id,
+            article_db.updated_at,
+            article_db.favorites_count,
+            article_db.tag_names,
+            author_db.updated_at,
+            following,
+            favorited,
+        )
+    )
+    content = render_article(
+        article=article_db,
+        author=author_db,
+        following=following,
+        favorited=favorited,
+        favorites_count=article_db.favorites_count,
+        tag_names=article_db.tag_names,
     )
+    return json_response(content, headers={"ETag": etag})
 
 
 @router.put(
@@ -246,25 +475,18 @@ async def update_article(
     session: SessionDB,
     current_user: CurrentUser,
     article_request: ArticleUpdateRequest,
-) -> ArticleResponse:
+) -> Response:
     article = article_request.article
-    response = await article_service.get_article_author_tags_favorite(
+    response = await article_service.get_article_and_author(
         session=session,
         article_slug=slug,
-        current_user_id=current_user.id,
     )
     if not response:
         raise ArticleNotFoundException()
-    (
-        article_db,
-        author_db,
-        following,
-        favorites_count,
-        favorited,
-        tags_string,
-    ) = response
+    article_db, author_db = response
     if article_db.author_id != current_user.id:
         raise ArticleNotAuthorException()
+    viewer = await _get_viewer_state(session=session, current_user=current_user, rows=[article_db])
 
     if article.title or article.body or article.description:
         article_db = await article_service.update_article(
@@ -273,39 +495,27 @@ async def update_article(
             request=article,
         )
 
-    tags = tags_string.split(",") if tags_string else []
+    tags = article_db.tag_names
     if article.tag_list is not None:
         await tag_service.delete_tags_for_article(
             session=session,
             article_id=article_db.id,  # type: ignore[arg-type]
         )
-        if article.tag_list:
-            await tag_service.create_tags_for_article(
-                session=session,
-                article_id=article_db.id,  # type: ignore[arg-type]
-                tag_names=article.tag_list,
-            )
-        tags = article.tag_list
-
-    return ArticleResponse(
-        article=ArticleDataComplete(
-            slug=article_db.slug,
-            title=article_db.title,
-            description=article_db.description,
-            body=article_db.body,
-            author=ProfileData(
-                username=author_db.username,
-                bio=author_db.bio,
-                image=author_db.image,
-                following=following,
-            ),
-            tag_list=sorted(tags),
-            favorited=favorited,
-            favorites_count=favorites_count,
-            created_at=article_db.created_at,
-            updated_at=article_db.updated_at,
+        tags = await tag_service.create_tags_for_article(
+            session=session,
+            article_id=article_db.id,  # type: ignore[arg-type]
+            tag_names=article.tag_list,
         )
+
+    content = render_article(
+        article=article_db,
+        author=author_db,
+        following=article_db.author_id in viewer.following,
+        favorited=article_db.id in viewer.favorited,
+        favorites_count=article_db.favorites_count,
+        tag_names=tags,
     )
+    return json_response(content)
 
 
 @router.delete(
@@ -344,48 +554,24 @@ async def favorite_article(
     slug: str,
     session: SessionDB,
     current_user: CurrentUser,
-) -> ArticleResponse:
-    response = await article_service.get_article_author_tags_favorite(
+) -> Response:
+    # Favoriting twice leaves the article as it is and returns its state.
+    row = await favorite_service.favorite_article(
         session=session,
+        user_id=current_user.id,  # type: ignore[arg-type]
         article_slug=slug,
-        current_user_id=current_user.id,
     )
-    if response is None:
+    if row is None:
         raise ArticleNotFoundException()
-    (
-        article_db,
-        author_db,
-        following,
-        favorites_count,
-        favorited,
-        tags_string,
-    ) = response
-    if favorited:
-        raise ArticleAlreadyFavoritedException()
-    await favorite_service.favorite_article(
-        session=session,
-        user_id=current_user.id,  # type: ignore[arg-type]
-        article_id=article_db.id,  # type: ignore[arg-type]
-    )
-    return ArticleResponse(
-        article=ArticleDataComplete(
-            slug=article_db.slug,
-            title=article_db.title,
-            description=article_db.description,
-            body=article_db.body,
-            author=ProfileData(
-                username=author_db.username,
-                bio=author_db.bio,
-                image=author_db.image,
-                following=following,
-            ),
-            tag_list=sorted(tags_string.split(",")) if tags_string else [],
-            favorited=True,
-            favorites_count=favorites_count + 1,
-            created_at=article_db.created_at,
-            updated_at=article_db.updated_at,
-        ),
+    content = render_article(
+        article=row.Article,
+        author=row.User,
+        following=row.following,
+        favorited=True,
+        favorites_count=row.favorites_count,
+        tag_names=row.Article.tag_names,
     )
+    return json_response(content)
 
 
 @router.delete(
@@ -399,49 +585,20 @@ async def unfavorite_article(
     slug: str,
     session: SessionDB,
     current_user: CurrentUser,
-) -> ArticleResponse:
-    response = await article_service.get_article_author_tags_favorite(
+) -> Response:
+    row = await favorite_service.unfavorite_article(
         session=session,
+        user_id=current_user.id,  # type: ignore[arg-type]
         article_slug=slug,
-        current_user_id=current_user.id,
     )
-    if response is None:
+    if row is None:
         raise ArticleNotFoundException()
-    (
-        article_db,
-        user_db,
-        following,
-        favorites_count,
-        favorited,
-        tags_string,
-    ) = response
-
-    if not favorited:
-        raise ArticleNotFavoritedException()
-
-    await favorite_service.unfavorite_article(
-        session=session,
-        user_id=current_user.id,  # type: ignore[arg-type]
-        article_id=article_db.id,  # type: ignore[arg-type]
-    )
-    favorites_count = favorites_count - 1 if favorited else favorites_count
-    tags = sorted(tags_string.split(",")) if tags_string else []
-    return ArticleResponse(
-        article=ArticleDataComplete(
-            slug=article_db.slug,
-            title=article_db.title,
-            description=article_db.description,
-            body=article_db.body,
-            author=ProfileData(
-                username=user_db.username,
-                bio=user_db.bio,
-                image=user_db.image,
-                following=following,
-            ),
-            tag_list=tags,
-            favorited=False,
-            favorites_count=favorites_count,
-            created_at=article_db.created_at,
-            updated_at=article_db.updated_at,
-        ),
+    content = render_article(
+        article=row.Article,
+        author=row.User,
+        following=row.following,
+        favorited=False,
+        favorites_count=row.favorites_count,
+        tag_names=row.Article.tag_names,
     )
+    return json_response(content)
@@ -1,10 +1,20 @@
 import logging
+from typing import Any, Sequence
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
 import conduit.services.article as article_service
 import conduit.services.comment as comment_service
-from conduit.api.dependencies import CurrentOptionalUser, CurrentUser, SessionDB
+import conduit.services.viewer as viewer_service
+from conduit.api.dependencies import (
+    CurrentOptionalUser,
+    CurrentUser,
+    IfNoneMatch,
+    SessionDB,
+    SessionReadOnly,
+)
+from conduit.api.responses import json_response, render_comment, render_comments
+from conduit.core.utils.etag import etag_matches, make_etag, not_modified
 from conduit.exceptions import (
     ArticleNotFoundException,
     CommentNotArticleException,
@@ -12,17 +22,27 @@ from conduit.exceptions import (
     CommentNotFoundException,
 )
 from conduit.schemas.comment import (
-    CommentData,
     CommentRegisterRequest,
     CommentResponse,
     CommentsResponse,
 )
-from conduit.schemas.profile import ProfileData
+from conduit.services.viewer import ViewerState
 
 router = APIRouter()
 log = logging.getLogger("conduit.api.comments")
 
 
+def _comments_etag(*, response: Sequence[Any], viewer: ViewerState) -> str:
+    # Mirrors the aggregates of comment_service.get_comments_version.
+    return make_etag(
+        len(response),
+        max((comment.id for comment, _ in response), default=None),
+        max((comment.updated_at for comment, _ in response), default=None),
+        max((user.updated_at for _, user in response), default=None),
+        sorted(viewer.following),
+    )
+
+
 @router.post(
     path="/articles/{slug}/comments",
     tags=["comments"],
@@ -35,7 +55,7 @@ async def add_comment(
     session: SessionDB,
     current_user: CurrentUser,
     comment_register: CommentRegisterRequest,
-) -> CommentResponse:
+) -> Response:
     comment = comment_register.comment
     article = await article_service.get_article_by_slug(
         session=session,
@@ -50,19 +70,8 @@ async def add_comment(
         article_id=article.id,  # type: ignore[arg-type]
         user_id=current_user.id,  # type: ignore[arg-type]
     )
-    return CommentResponse(
-        comment=CommentData(
-            id=comment_db.id,
-            body=comment_db.body,
-            author=ProfileData(
-                username=current_user.username,
-                bio=current_user.bio,
-                image=current_user.image,
-            ),
-            created_at=comment_db.created_at,
-            updated_at=comment_db.updated_at,
-        )
-    )
+    content = render_comment(comment=comment_db, author=current_user, following=False)
+    return json_response(content, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -74,9 +83,31 @@ async def add_comment(
 )
 async def get_comments(
     slug: str,
-    session: SessionDB,
+    session: SessionReadOnly,
     current_user: CurrentOptionalUser,
-) -> CommentsResponse:
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    if if_none_match:
+        version = await comment_service.get_comments_version(
+            session=session,
+            article_slug=slug,
+        )
+        if not version:
+            raise ArticleNotFoundException()
+        viewer = await viewer_service.get_viewer_state(
+            session=session,
+            current_user_id=current_user.id if current_user else None,
+            author_ids=version.author_ids or (),
+        )
+        etag = make_etag(
+            version.comments_count,
+            version.last_comment_id,
+            version.comments_updated_at,
+            version.authors_updated_at,
+            sorted(viewer.following),
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
     article = await article_service.get_article_by_slug(
         session=session,
         slug=slug,
@@ -86,25 +117,15 @@ async def get_comments(
     response = await comment_service.get_comments_and_users_by_article_id(
         session=session,
         article_id=article.id,  # type: ignore[arg-type]
-        current_user_id=current_user.id if current_user else None,
     )
-    return CommentsResponse(
-        comments=[
-            CommentData(
-                id=comment.id,
-                body=comment.body,
-                author=ProfileData(
-                    username=user.username,
-                    bio=user.bio,
-                    image=user.image,
-                    following=following,
-                ),
-                created_at=comment.created_at,
-                updated_at=comment.updated_at,
-            )
-            for comment, user, following in response
-        ]
+    viewer = await viewer_service.get_viewer_state(
+        session=session,
+        current_user_id=current_user.id if current_user else None,
+        author_ids=(comment.author_id for comment, _ in response),
     )
+    content = render_comments(rows=response, viewer=viewer)
+    headers = {"ETag": _comments_etag(response=response, viewer=viewer)}
+    return json_response(content, headers=headers)
 
 
 @router.delete(
@@ -1,10 +1,16 @@
 import logging
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
 import conduit.services.follower as follower_service
 import conduit.services.user as user_service
-from conduit.api.dependencies import CurrentOptionalUser, CurrentUser, SessionDB
+from conduit.api.dependencies import (
+    CurrentOptionalUser,
+    CurrentUser,
+    SessionDB,
+    SessionReadOnly,
+)
+from conduit.api.responses import json_response, render_profile
 from conduit.exceptions import (
     ProfileAlreadyFollowedException,
     ProfileFollowYourselfException,
@@ -12,7 +18,7 @@ from conduit.exceptions import (
     ProfileNotFoundException,
     ProfileUnfollowYourselfException,
 )
-from conduit.schemas.profile import ProfileData, ProfileResponse
+from conduit.schemas.profile import ProfileResponse
 
 router = APIRouter()
 log = logging.getLogger("conduit.api.profiles")
@@ -27,9 +33,9 @@ log = logging.getLogger("conduit.api.profiles")
 )
 async def get_profile(
     username: str,
-    session: SessionDB,
+    session: SessionReadOnly,
     current_user: CurrentOptionalUser,
-) -> ProfileResponse:
+) -> Response:
     response = await user_service.get_user_by_username(
         session=session,
         username=username,
@@ -38,14 +44,7 @@ async def get_profile(
     user_db, following = response if response else (None, False)
     if not user_db:
         raise ProfileNotFoundException()
-    return ProfileResponse(
-        profile=ProfileData(
-            username=user_db.username,
-            bio=user_db.bio,
-            image=user_db.image,
-            following=following,
-        )
-    )
+    return json_response(render_profile(user=user_db, following=following))
 
 
 @router.post(
@@ -59,7 +58,7 @@ async def follow_user(
     username: str,
     session: SessionDB,
     current_user: CurrentUser,
-) -> ProfileResponse:
+) -> Response:
     response = await user_service.get_user_by_username(
         session=session,
         username=username,
@@ -77,14 +76,7 @@ async def follow_user(
         follower_id=current_user.id,  # type: ignore[arg-type]
         followed_id=user_db.id,  # type: ignore[arg-type]
     )
-    return ProfileResponse(
-        profile=ProfileData(
-            username=user_db.username,
-            bio=user_db.bio,
-            image=user_db.image,
-            following=True,
-        )
-    )
+    return json_response(render_profile(user=user_db, following=True))
 
 
 @router.delete(
@@ -98,7 +90,7 @@ async def unfollow_user(
     username: str,
     session: SessionDB,
     current_user: CurrentUser,
-) -> ProfileResponse:
+) -> Response:
     response = await user_service.get_user_by_username(
         session=session,
         username=username,
@@ -116,11 +108,4 @@ async def unfollow_user(
         follower_id=current_user.id,  # type: ignore[arg-type]
         followed_id=user_db.id,  # type: ignore[arg-type]
     )
-    return ProfileResponse(
-        profile=ProfileData(
-            username=user_db.username,
-            bio=user_db.bio,
-            image=user_db.image,
-            following=False,
-        )
-    )
+    return json_response(render_profile(user=user_db, following=False))
@@ -1,9 +1,12 @@
 import logging
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
 import conduit.services.tag as tag_service
-from conduit.api.dependencies import SessionDB
+from conduit.api.dependencies import AuthorizationHeader, IfNoneMatch, SessionReadOnly
+from conduit.api.responses import json_response
+from conduit.core.cache import RESPONSE_CACHE, TAGS, CachedResponse
+from conduit.core.utils.etag import etag_matches, make_etag, not_modified
 from conduit.schemas.tag import TagsResponse
 
 router = APIRouter()
@@ -17,6 +20,29 @@ log = logging.getLogger("conduit.api.tags")
     summary="Get all tags.",
     status_code=status.HTTP_200_OK,
 )
-async def get_tags(session: SessionDB) -> TagsResponse:
+async def get_tags(
+    session: SessionReadOnly,
+    if_none_match: IfNoneMatch = None,
+    authorization: AuthorizationHeader = None,
+) -> Response:
+    anonymous = authorization is None
+    generation = RESPONSE_CACHE.generation(TAGS)
+    cached = RESPONSE_CACHE.get(TAGS, None) if anonymous else None
+    if cached is not None and cached.etag:
+        if etag_matches(if_none_match, cached.etag):
+            return not_modified(cached.etag)
+        return json_response(cached.content, headers={"ETag": cached.etag})
     tags = await tag_service.get_all_tags(session=session)
-    return TagsResponse(tags=[tag.name for tag in tags])
+    content = TagsResponse(tags=[tag.name for tag in tags]).model_dump_json().encode()
+    # Tags carry no version of their own, so the body is the validator.
+    etag = make_etag(content)
+    if anonymous:
+        RESPONSE_CACHE.set(
+            TAGS,
+            None,
+            CachedResponse(content=content, etag=etag),
+            generation=generation,
+        )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return json_response(content, headers={"ETag": etag})
@@ -1,12 +1,17 @@
 import logging
 
-from fastapi import APIRouter, status
-
-from conduit.api.dependencies import CurrentUser, SessionDB, SettingsDep, Token
+from fastapi import APIRouter, Depends, status
+
+from conduit.api.dependencies import (
+    CurrentUser,
+    SessionDB,
+    SettingsDep,
+    Token,
+    limit_login_attempts,
+    limit_registration_attempts,
+)
 from conduit.exceptions import (
     InvalidCredentialsException,
-    UserEmailExistsException,
-    UserNameExistsException,
     UserNotFoundException,
 )
 from conduit.schemas.user import (
@@ -30,6 +35,7 @@ log = logging.getLogger("conduit.api.users")
     response_model=UserResponse,
     summary="Register new user",
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_registration_attempts)],
 )
 async def add_user(
     session: SessionDB,
@@ -37,21 +43,6 @@ async def add_user(
     settings: SettingsDep,
 ) -> UserResponse:
     user = user_request.user
-    maybe_user_email_db = await user_service.get_user_by_email(
-        session=session,
-        email=user.email,
-    )
-    if maybe_user_email_db:
-        raise UserEmailExistsException()
-
-    response = await user_service.get_user_by_username(
-        session=session,
-        username=user.username,
-    )
-    maybe_user_username_db, _ = response if response else (None, False)
-    if maybe_user_username_db:
-        raise UserNameExistsException()
-
     db_user = await user_service.create_user(
         session=session,
         user_registration=user,
@@ -78,6 +69,7 @@ async def add_user(
     response_model=UserResponse,
     summary="Login with email/password",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(limit_login_attempts)],
 )
 async def login_user(
     session: SessionDB,
@@ -91,7 +83,7 @@ async def login_user(
     )
     if not user_db:
         raise UserNotFoundException()
-    if not password_service.verify_password(
+    if not await password_service.verify_password_async(
         plain_password=user.password.get_secret_value(),
         hashed_password=user_db.hashed_password,
     ):
@@ -149,24 +141,6 @@ async def update_current_user(
     user_request: UserUpdateRequest,
 ) -> UserResponse:
     user = user_request.user
-    if user.email:
-        existing_user = await user_service.get_user_by_email(
-            session=session,
-            email=user.email,
-        )
-        if existing_user and existing_user.id != current_user.id:
-            raise UserEmailExistsException()
-
-    if user.username:
-        response = await user_service.get_user_by_username(
-            session=session,
-            username=user.username,
-            current_user_id=current_user.id,
-        )
-        existing_user = response[0] if response else None
-        if existing_user and existing_user.id != current_user.id:
-            raise UserNameExistsException()
-
     current_user = await user_service.update_user(
         session=session,
         user_update=user,
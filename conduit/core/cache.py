@@ -0,0 +1,182 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Tuple
+
+from opentelemetry import metrics
+
+from conduit.core.settings import get_settings_cached
+
+SETTINGS = get_settings_cached()
+
+meter = metrics.get_meter("conduit.cache")
+cache_hits = meter.create_counter(
+    name="conduit.response_cache.hits",
+    description="Responses served from the in-process response cache",
+)
+cache_misses = meter.create_counter(
+    name="conduit.response_cache.misses",
+    description="Cacheable responses that had to be rendered",
+)
+user_cache_hits = meter.create_counter(
+    name="conduit.user_cache.hits",
+    description="Authenticated requests that resolved the current user from memory",
+)
+user_cache_misses = meter.create_counter(
+    name="conduit.user_cache.misses",
+    description="Authenticated requests that had to load the current user",
+)
+fragment_cache_hits = meter.create_counter(
+    name="conduit.fragment_cache.hits",
+    description="Listing fragments reused without a database read or re-rendering",
+)
+fragment_cache_misses = meter.create_counter(
+    name="conduit.fragment_cache.misses",
+    description="Listing fragments that had to be loaded and rendered",
+)
+
+CacheKey = Tuple[str, Hashable]
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    etag: str | None = None
+
+
+ARTICLES = "articles"
+TAGS = "tags"
+
+
+class ResponseCache:
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, Tuple[float, CachedResponse]] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def get(self, namespace: str, key: Hashable) -> CachedResponse | None:
+        entry = self._entries.get((namespace, key))
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end((namespace, key))
+            cache_hits.add(1, {"namespace": namespace})
+            return entry[1]
+        if entry is not None:
+            del self._entries[(namespace, key)]
+        cache_misses.add(1, {"namespace": namespace})
+        return None
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: CachedResponse,
+        *,
+        generation: int,
+    ) -> None:
+        # A response rendered before an invalidation must not be stored after it.
+        if self.max_entries <= 0 or generation != self.generation(namespace):
+            return
+        self._entries[(namespace, key)] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self._generations[namespace] = self.generation(namespace) + 1
+        for key in [key for key in self._entries if key[0] in namespaces]:
+            del self._entries[key]
+
+
+RESPONSE_CACHE = ResponseCache(
+    ttl_seconds=SETTINGS.response_cache_ttl_seconds,
+    max_entries=SETTINGS.response_cache_max_entries,
+)
+
+
+class UserCache:
+    # Holds column values rather than instances, so every request gets its own
+    # object and nothing is shared between sessions.
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._generation = 0
+
+    def get(self, user_id: int) -> Dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            user_cache_hits.add(1)
+            return entry[1]
+        if entry is not None:
+            del self._entries[user_id]
+        user_cache_misses.add(1)
+        return None
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, user_id: int, values: Dict[str, Any], *, generation: int) -> None:
+        if self.max_entries <= 0 or generation != self._generation:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._generation += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+
+USER_CACHE = UserCache(
+    ttl_seconds=SETTINGS.user_cache_ttl_seconds,
+    max_entries=SETTINGS.user_cache_max_entries,
+)
+
+
+class FragmentCache:
+    # Entries remember the version of the row they were rendered from and only
+    # match a lookup for that same version, so a fragment left behind by a write
+    # in another worker is never served; invalidate only frees the memory early.
+
+    def __init__(self, *, name: str, max_entries: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, Tuple[Hashable, Any]] = OrderedDict()
+
+    def get(self, key: int, version: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            fragment_cache_hits.add(1, {"fragment": self.name})
+            return entry[1]
+        fragment_cache_misses.add(1, {"fragment": self.name})
+        return None
+
+    def set(self, key: int, version: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: int) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+ARTICLE_FRAGMENTS = FragmentCache(name="article", max_entries=SETTINGS.fragment_cache_max_entries)
+AUTHOR_FRAGMENTS = FragmentCache(name="author", max_entries=SETTINGS.fragment_cache_max_entries)
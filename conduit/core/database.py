@@ -1,19 +1,132 @@
-from typing import Any
+import asyncio
+import logging
+import math
+import time
+from functools import partial
+from typing import Any, Callable, List
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+import psycopg
+from fastapi import Request, Response
+from opentelemetry import metrics
+from psycopg import sql
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from conduit.core.cache import USER_CACHE
+from conduit.core.pool import create_instrumented_engine
 from conduit.core.settings import get_settings_cached
 
 SETTINGS = get_settings_cached()
+log = logging.getLogger("conduit.core.database")
 
-ENGINE = create_async_engine(
-    url=SETTINGS.database_uri,
-    pool_size=10,
-    max_overflow=20,
-    pool_recycle=300,
+meter = metrics.get_meter("conduit.database")
+read_routes = meter.create_counter(
+    name="conduit.database.reads",
+    description="Read-only sessions opened, by the server they were routed to",
 )
+replica_lag = meter.create_histogram(
+    name="conduit.database.replica_lag",
+    unit="s",
+    description="Replication lag observed by the replica health check",
+)
+
+ENGINE = create_instrumented_engine(url=SETTINGS.database_uri, name="primary")
+
+# Replicas stay out of rotation until the lag check has seen them caught up.
+REPLICA_LAG = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+
+class ReplicaSet:
+
+    def __init__(self, *, engines: List[AsyncEngine], max_lag_seconds: float) -> None:
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self._in_rotation: List[AsyncEngine] = []
+        self._next = 0
+
+    def choose(self) -> AsyncEngine | None:
+        if not self._in_rotation:
+            return None
+        self._next = (self._next + 1) % len(self._in_rotation)
+        return self._in_rotation[self._next]
+
+    async def _query_lag(self, engine: AsyncEngine) -> float | None:
+        async with engine.connect() as connection:
+            return (await connection.execute(REPLICA_LAG)).scalar()
+
+    async def _lag(self, engine: AsyncEngine) -> float | None:
+        try:
+            lag = await asyncio.wait_for(self._query_lag(engine), timeout=self.max_lag_seconds)
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+            log.warning("Replica %s failed its lag check", engine.url.host, exc_info=True)
+            return None
+        if lag is not None:
+            replica_lag.record(float(lag), {"replica": str(engine.url.host)})
+        return lag
+
+    async def check(self) -> None:
+        in_rotation = []
+        for engine in self.engines:
+            lag = await self._lag(engine)
+            if lag is not None and lag <= self.max_lag_seconds:
+                in_rotation.append(engine)
+            elif engine in self._in_rotation:
+                log.warning("Replica %s taken out of rotation, lag %s", engine.url.host, lag)
+        self._in_rotation = in_rotation
+
+    async def monitor(self, *, interval: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+REPLICAS = ReplicaSet(
+    engines=[
+        create_instrumented_engine(url=uri, name=f"replica:{uri.host}")
+        for uri in SETTINGS.database_replica_uris
+    ],
+    max_lag_seconds=SETTINGS.database_replica_max_lag_seconds,
+)
+
+
+class ReadYourWrites:
+    # Clients who just wrote read from the primary for a while, so a replica
+    # that has not replayed their write yet never serves them. The pin travels
+    # with the client as a cookie holding its expiry, so whichever worker or
+    # instance serves the next read routes it without a lookup. Only set while
+    # replicas are configured.
+
+    def __init__(self, *, enabled: bool, window_seconds: float) -> None:
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+
+    def pinned_until(self) -> float:
+        return time.time() + self.window_seconds
+
+    def is_pinned(self, pinned_until: str | None) -> bool:
+        try:
+            until = float(pinned_until)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return False
+        now = time.time()
+        # A client cannot hold a longer pin than a write would have given it.
+        return now < until <= now + self.window_seconds
+
+
+READ_YOUR_WRITES = ReadYourWrites(
+    enabled=bool(REPLICAS.engines),
+    window_seconds=SETTINGS.database_read_your_writes_seconds,
+)
+READ_YOUR_WRITES_COOKIE = "conduit_primary_until"
 
 
 AsyncSessionLocal = sessionmaker(
@@ -23,9 +136,92 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
-async def get_db() -> Any:
+async def get_db(request: Request) -> Any:
+    # One transaction per request: services only flush, and the request either
+    # commits once here or rolls back as a whole.
     async with AsyncSessionLocal() as session:
         try:
             yield session
-        finally:
-            await session.close()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        if READ_YOUR_WRITES.enabled and session.info.get("wrote"):
+            request.state.primary_until = READ_YOUR_WRITES.pinned_until()
+
+
+def get_read_engine(*, pinned_until: str | None) -> AsyncEngine:
+    # Falls back to the primary when no replica is caught up.
+    engine = None
+    if not READ_YOUR_WRITES.is_pinned(pinned_until):
+        engine = REPLICAS.choose()
+    read_routes.add(1, {"server": "primary" if engine is None else "replica"})
+    return engine or ENGINE
+
+
+async def pin_reads_to_primary(request: Request, call_next: Any) -> Response:
+    # Sends the pin recorded by get_db back with the response.
+    response = await call_next(request)
+    primary_until = getattr(request.state, "primary_until", None)
+    if primary_until is not None:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{primary_until:.3f}",
+            max_age=math.ceil(READ_YOUR_WRITES.window_seconds),
+            httponly=True,
+            secure=SETTINGS.environment != "local",
+            samesite="lax",
+        )
+    return response
+
+
+def set_session_wrote(session: AsyncSession) -> None:
+    # For writes the events below cannot see, such as DML inside a SELECT's CTEs.
+    session.info["wrote"] = True
+
+
+def on_commit(session: AsyncSession, callback: Callable[..., Any], *args: Any) -> None:
+    session.info.setdefault("on_commit", []).append(partial(callback, *args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session: Session, _flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(state: ORMExecuteState) -> None:
+    if state.statement.is_dml:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_commit(session: Session) -> None:
+    session.info.pop("on_commit", None)
+
+
+async def listen_for_user_invalidations(*, channel: str) -> None:
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                host=SETTINGS.database_host,
+                port=SETTINGS.database_port,
+                user=SETTINGS.database_user,
+                password=SETTINGS.database_password,
+                dbname=SETTINGS.database_name,
+                autocommit=True,
+            ) as connection:
+                await connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                # Notifications sent while we were not listening are lost.
+                USER_CACHE.clear()
+                async for notify in connection.notifies():
+                    USER_CACHE.invalidate(int(notify.payload))
+        except psycopg.OperationalError:
+            log.warning("User cache listener lost its connection, reconnecting")
+            await asyncio.sleep(1.0)
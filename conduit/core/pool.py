@@ -0,0 +1,84 @@
+import time
+from typing import Any, Iterable, List
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from conduit.core.settings import get_settings_cached
+
+SETTINGS = get_settings_cached()
+
+ENGINES: List[AsyncEngine] = []
+
+
+def _observe_overflow(_options: CallbackOptions) -> Iterable[Observation]:
+    for engine in ENGINES:
+        pool = engine.pool
+        if isinstance(pool, InstrumentedPool):
+            yield Observation(max(pool.overflow(), 0), {"pool": pool.logging_name})
+
+
+meter = metrics.get_meter("conduit.database")
+checked_out = meter.create_up_down_counter(
+    name="conduit.database.pool.checked_out",
+    description="Connections currently checked out of the pool",
+)
+meter.create_observable_gauge(
+    name="conduit.database.pool.overflow",
+    callbacks=[_observe_overflow],
+    description="Connections open beyond pool_size",
+)
+checkout_wait = meter.create_histogram(
+    name="conduit.database.pool.checkout_wait",
+    unit="s",
+    description="Time spent getting a connection from the pool, including connecting",
+)
+checkout_timeouts = meter.create_counter(
+    name="conduit.database.pool.timeouts",
+    description="Checkouts that gave up after pool_timeout with the pool exhausted",
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Pool events fire once a connection has been handed out, so the wait
+    # before that, and giving up on it, are measured around connect() here.
+
+    def connect(self) -> PoolProxiedConnection:
+        attributes = {"pool": self.logging_name}
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            checkout_timeouts.add(1, attributes)
+            raise
+        finally:
+            checkout_wait.record(time.perf_counter() - start, attributes)
+
+
+def create_instrumented_engine(*, url: Any, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedPool,
+        pool_size=SETTINGS.database_pool_size,
+        max_overflow=SETTINGS.database_max_overflow,
+        pool_timeout=SETTINGS.database_pool_timeout_seconds,
+        pool_recycle=SETTINGS.database_pool_recycle_seconds,
+        pool_pre_ping=SETTINGS.database_pool_pre_ping,
+        pool_logging_name=name,
+    )
+    attributes = {"pool": name}
+
+    # Listeners on the engine carry over to the pool that dispose() recreates.
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checkout(*_args: Any) -> None:
+        checked_out.add(1, attributes)
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _checkin(*_args: Any) -> None:
+        checked_out.add(-1, attributes)
+
+    ENGINES.append(engine)
+    return engine
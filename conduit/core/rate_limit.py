@@ -0,0 +1,187 @@
+import time
+from collections import OrderedDict
+from ipaddress import ip_address, ip_network
+from typing import NamedTuple, Protocol, Sequence, Tuple
+
+from fastapi import Request
+from opentelemetry import metrics
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, func, update
+
+from conduit.core.database import ENGINE
+from conduit.core.settings import get_settings_cached
+from conduit.exceptions import RateLimitExceededException
+from conduit.models import RateLimitBucket
+
+SETTINGS = get_settings_cached()
+TRUSTED_PROXIES = [
+    ip_network(proxy, strict=False) for proxy in SETTINGS.auth_rate_limit_trusted_proxies
+]
+
+meter = metrics.get_meter("conduit.rate_limit")
+rate_limit_rejections = meter.create_counter(
+    name="conduit.rate_limit.rejections",
+    description="Login and registration attempts rejected by the rate limiter",
+)
+
+
+class Bucket(NamedTuple):
+    name: str
+    key: str
+    capacity: float
+    refill_per_second: float
+
+
+class BucketStore(Protocol):
+    # Takes a token from every bucket, or from none of them: the first bucket
+    # found empty is returned and the others keep their tokens.
+    async def take(self, buckets: Sequence[Bucket]) -> Bucket | None: ...
+
+
+class MemoryBucketStore:
+    # Each bucket is two floats; the least recently used ones are dropped first,
+    # which only ever hands a bucket back at full capacity.
+
+    def __init__(self, *, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+
+    async def take(self, buckets: Sequence[Bucket]) -> Bucket | None:
+        now = time.monotonic()
+        levels = []
+        for bucket in buckets:
+            tokens, refilled_at = self._buckets.pop(bucket.key, (bucket.capacity, now))
+            levels.append(
+                min(bucket.capacity, tokens + (now - refilled_at) * bucket.refill_per_second)
+            )
+        empty = next((bucket for bucket, tokens in zip(buckets, levels) if tokens < 1), None)
+        for bucket, tokens in zip(buckets, levels):
+            self._buckets[bucket.key] = (tokens if empty is not None else tokens - 1, now)
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+        return empty
+
+
+class DatabaseBucketStore:
+    # Shared between workers through an unlogged table. Each bucket is refilled
+    # with one upsert that also locks its row, using the database clock, and
+    # tokens are only taken once every bucket is known to have one.
+
+    def __init__(self, *, prune_every: int, idle_seconds: float) -> None:
+        self.prune_every = prune_every
+        self.idle_seconds = idle_seconds
+        self._calls = 0
+
+    async def take(self, buckets: Sequence[Bucket]) -> Bucket | None:
+        now = func.extract("epoch", func.clock_timestamp())
+        allowed = {}
+        async with ENGINE.begin() as connection:
+            # Rows are locked in key order so concurrent requests cannot deadlock.
+            for bucket in sorted(buckets, key=lambda bucket: bucket.key):
+                query = insert(RateLimitBucket).values(
+                    key=bucket.key,
+                    tokens=bucket.capacity,
+                    refilled_at=now,
+                    allowed=True,
+                )
+                refilled = func.least(
+                    bucket.capacity,
+                    RateLimitBucket.tokens
+                    + (query.excluded.refilled_at - RateLimitBucket.refilled_at)
+                    * bucket.refill_per_second,
+                )
+                query = query.on_conflict_do_update(
+                    index_elements=[RateLimitBucket.key],
+                    set_={
+                        "tokens": refilled,
+                        "refilled_at": query.excluded.refilled_at,
+                        "allowed": refilled >= 1,
+                    },
+                ).returning(RateLimitBucket.allowed)
+                allowed[bucket.key] = (await connection.execute(query)).scalar_one()
+            empty = next((bucket for bucket in buckets if not allowed[bucket.key]), None)
+            if empty is None:
+                await connection.execute(
+                    update(RateLimitBucket)
+                    .where(col(RateLimitBucket.key).in_(allowed))
+                    .values(tokens=RateLimitBucket.tokens - 1)
+                )
+            self._calls += 1
+            if self._calls % self.prune_every == 0:
+                await connection.execute(
+                    delete(RateLimitBucket).where(
+                        RateLimitBucket.refilled_at < now - self.idle_seconds
+                    )
+                )
+        return empty
+
+
+class AuthRateLimiter:
+
+    def __init__(
+        self,
+        *,
+        store: BucketStore,
+        ip_burst: int,
+        ip_per_minute: float,
+        email_burst: int,
+        email_per_minute: float,
+    ) -> None:
+        self.store = store
+        self.ip_burst = ip_burst
+        self.ip_per_second = ip_per_minute / 60
+        self.email_burst = email_burst
+        self.email_per_second = email_per_minute / 60
+
+    async def check(self, *, client_ip: str | None, email: str) -> None:
+        buckets = []
+        if client_ip is not None:
+            buckets.append(Bucket("ip", f"ip:{client_ip}", self.ip_burst, self.ip_per_second))
+        buckets.append(
+            Bucket("email", f"email:{email.lower()}", self.email_burst, self.email_per_second)
+        )
+        empty = await self.store.take(buckets)
+        if empty is not None:
+            rate_limit_rejections.add(1, {"key": empty.name})
+            raise RateLimitExceededException()
+
+
+def client_ip(request: Request) -> str | None:
+    # Behind a reverse proxy every connection comes from the proxy. When it is
+    # trusted, X-Forwarded-For is walked from the right and the first address
+    # not added by a trusted proxy is the client.
+    if request.client is None:
+        return None
+    host = request.client.host
+    if not _is_trusted_proxy(host):
+        return host
+    forwarded = ",".join(request.headers.getlist("X-Forwarded-For"))
+    for hop in reversed(forwarded.split(",")):
+        hop = hop.strip()
+        if hop and not _is_trusted_proxy(hop):
+            return hop
+    return host
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def create_bucket_store() -> BucketStore:
+    if SETTINGS.auth_rate_limit_backend == "database":
+        return DatabaseBucketStore(prune_every=1000, idle_seconds=3600)
+    return MemoryBucketStore(max_entries=SETTINGS.auth_rate_limit_max_entries)
+
+
+AUTH_RATE_LIMITER = AuthRateLimiter(
+    store=create_bucket_store(),
+    ip_burst=SETTINGS.auth_rate_limit_ip_burst,
+    ip_per_minute=SETTINGS.auth_rate_limit_ip_per_minute,
+    email_burst=SETTINGS.auth_rate_limit_email_burst,
+    email_per_minute=SETTINGS.auth_rate_limit_email_per_minute,
+)
@@ -1,9 +1,27 @@
+import hashlib
+import time
+from collections import OrderedDict
 from typing import Any
 
 from fastapi.security import APIKeyHeader
+from opentelemetry import metrics
 from starlette.requests import Request
 
+from conduit.core.settings import get_settings_cached
 from conduit.exceptions import TokenInvalidException, TokenMissingException
+from conduit.schemas.token import TokenPayload
+
+SETTINGS = get_settings_cached()
+
+meter = metrics.get_meter("conduit.security")
+token_cache_hits = meter.create_counter(
+    name="conduit.token_cache.hits",
+    description="Access tokens accepted without re-verifying the signature",
+)
+token_cache_misses = meter.create_counter(
+    name="conduit.token_cache.misses",
+    description="Access tokens that had to be decoded and verified",
+)
 
 
 class HTTPTokenHeader(APIKeyHeader):
@@ -27,3 +45,39 @@ class HTTPTokenHeader(APIKeyHeader):
             raise TokenInvalidException()
 
         return token
+
+
+class VerifiedTokenCache:
+    # Tokens are keyed by their digest so raw credentials are not kept around,
+    # and an entry is only good until the token's own exp.
+
+    def __init__(self, *, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, TokenPayload] = OrderedDict()
+
+    def get(self, token: str) -> TokenPayload | None:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self._entries.get(key)
+        if payload is not None and payload.exp is not None and payload.exp > time.time():
+            self._entries.move_to_end(key)
+            token_cache_hits.add(1)
+            return payload
+        if payload is not None:
+            del self._entries[key]
+        token_cache_misses.add(1)
+        return None
+
+    def set(self, token: str, payload: TokenPayload) -> None:
+        if self.max_entries <= 0 or payload.exp is None:
+            return
+        key = hashlib.sha256(token.encode()).digest()
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+TOKEN_CACHE = VerifiedTokenCache(max_entries=SETTINGS.token_cache_max_entries)
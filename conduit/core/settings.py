@@ -15,6 +15,15 @@ class Settings(BaseSettings):
     database_host: str
     database_port: int
     database_name: str
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 300
+    database_pool_pre_ping: bool = False
+    database_replica_hosts: List[str] = []
+    database_replica_max_lag_seconds: float = 5.0
+    database_replica_check_seconds: float = 2.0
+    database_read_your_writes_seconds: float = 10.0
 
     secret_key: str
     otlp_grpc_endpoint: HttpUrl
@@ -22,6 +31,25 @@ class Settings(BaseSettings):
     environment: Literal["local", "staging", "production"] = "local"
     algorithm: Literal["HS256"] = "HS256"
     access_token_expire_minutes: int = 120
+    token_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: float = 5.0
+    user_cache_max_entries: int = 10000
+    user_cache_notify_channel: str | None = None
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 16
+    auth_rate_limit_backend: Literal["memory", "database"] = "memory"
+    auth_rate_limit_ip_burst: int = 20
+    auth_rate_limit_ip_per_minute: float = 30.0
+    auth_rate_limit_email_burst: int = 5
+    auth_rate_limit_email_per_minute: float = 5.0
+    auth_rate_limit_max_entries: int = 100000
+    auth_rate_limit_trusted_proxies: List[str] = []
+    feed_fanout_max_followers: int = 10000
+    articles_max_limit: int = 1000
+    articles_stream_max_limit: int = 100000
+    response_cache_ttl_seconds: float = 5.0
+    response_cache_max_entries: int = 1024
+    fragment_cache_max_entries: int = 50000
 
     class Config:
         env_file = ".env.local" if Path(".env.local").exists() else ".env"
@@ -40,6 +68,21 @@ class Settings(BaseSettings):
             database=self.database_name,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def database_replica_uris(self) -> List[URL]:
+        return [
+            URL.create(
+                drivername="postgresql+psycopg_async",
+                username=self.database_user,
+                password=self.database_password,
+                host=host,
+                port=self.database_port,
+                database=self.database_name,
+            )
+            for host in self.database_replica_hosts
+        ]
+
 
 @lru_cache()
 def get_settings_cached() -> Settings:
@@ -0,0 +1,25 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Tuple
+
+CursorKey = datetime | float
+
+
+def encode_cursor(sort_key: CursorKey, article_id: int) -> str:
+    value = sort_key.isoformat() if isinstance(sort_key, datetime) else sort_key
+    payload = json.dumps([value, article_id], separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[CursorKey, int]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        value, article_id = json.loads(urlsafe_b64decode(cursor + padding))
+        if isinstance(value, str):
+            return datetime.fromisoformat(value), int(article_id)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value), int(article_id)
+    except (TypeError, ValueError) as ex:
+        raise ValueError("invalid cursor") from ex
+    raise ValueError("invalid cursor")
@@ -44,14 +44,16 @@ class ArticleNotAuthorException(BaseException):
     errors = {"article": ["forbidden"]}
 
 
-class ArticleAlreadyFavoritedException(BaseException):
+class ArticleCursorInvalidException(BaseException):
     status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-    detail = "Article already favorited"
+    detail = "Invalid pagination cursor"
+    errors = {"cursor": ["invalid"]}
 
 
-class ArticleNotFavoritedException(BaseException):
+class ArticleLimitTooLargeException(BaseException):
     status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-    detail = "Article not favorited"
+    detail = "Limit is too large for this response format"
+    errors = {"limit": ["too large"]}
 
 
 class CommentNotFoundException(BaseException):
@@ -126,6 +128,18 @@ class TokenInvalidException(BaseException):
     errors = {"token": ["invalid"]}
 
 
+class PasswordHasherBusyException(BaseException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Too many password checks in progress, try again shortly"
+    errors = {"password": ["busy"]}
+
+
+class RateLimitExceededException(BaseException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Too many attempts, try again later"
+    errors = {"credentials": ["too many attempts"]}
+
+
 def add_http_exception_handler(app: FastAPI) -> None:
 
     @app.exception_handler(BaseException)
@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,19 +27,45 @@ from conduit.api.routes.health import router as health_router
 from conduit.api.routes.profile import router as profiles_router
 from conduit.api.routes.tag import router as tags_router
 from conduit.api.routes.user import router as users_router
-from conduit.core.database import ENGINE
+from conduit.core.database import (
+    ENGINE,
+    REPLICAS,
+    listen_for_user_invalidations,
+    pin_reads_to_primary,
+)
 from conduit.core.settings import get_settings_cached
 from conduit.exceptions import add_http_exception_handler
 
 settings = get_settings_cached()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    tasks = []
+    if settings.user_cache_notify_channel:
+        tasks.append(
+            asyncio.create_task(
+                listen_for_user_invalidations(channel=settings.user_cache_notify_channel)
+            )
+        )
+    if REPLICAS.engines:
+        tasks.append(
+            asyncio.create_task(REPLICAS.monitor(interval=settings.database_replica_check_seconds))
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+
+
 app = FastAPI(
     title="Conduit Backend API",
     description="Backend API for the Conduit application.",
     version="0.1.0",
     docs_url="/",
+    lifespan=lifespan,
 )
 add_http_exception_handler(app)
+app.middleware("http")(pin_reads_to_primary)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[str(origin).rstrip("/") for origin in settings.allowed_cors_origins],
@@ -117,4 +146,6 @@ FastAPIInstrumentor.instrument_app(
     tracer_provider=tracer_provider,
     meter_provider=meter_provider,
 )
-SQLAlchemyInstrumentor().instrument(engine=ENGINE.sync_engine)
+SQLAlchemyInstrumentor().instrument(
+    engines=[ENGINE.sync_engine, *(engine.sync_engine for engine in REPLICAS.engines)],
+)
@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import List
 
-from sqlalchemy import Column, DateTime, func, text
+from sqlalchemy import Column, Computed, DateTime, Index, Text, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlmodel import Field, SQLModel
 
 
@@ -12,6 +14,7 @@ class Follower(SQLModel, table=True):  # type: ignore[call-arg]
     following_id: int = Field(
         foreign_key="user.id",
         primary_key=True,
+        index=True,
     )
     created_at: datetime | None = Field(
         sa_column=Column(
@@ -31,6 +34,7 @@ class Favorite(SQLModel, table=True):  # type: ignore[call-arg]
         foreign_key="article.id",
         primary_key=True,
         ondelete="CASCADE",
+        index=True,
     )
     created_at: datetime | None = Field(
         sa_column=Column(
@@ -51,6 +55,7 @@ class ArticleTag(SQLModel, table=True):  # type: ignore[call-arg]
         foreign_key="tag.id",
         primary_key=True,
         ondelete="CASCADE",
+        index=True,
     )
     created_at: datetime | None = Field(
         sa_column=Column(
@@ -61,6 +66,35 @@ class ArticleTag(SQLModel, table=True):  # type: ignore[call-arg]
     )
 
 
+class Timeline(SQLModel, table=True):  # type: ignore[call-arg]
+    __table_args__ = (
+        Index(
+            "ix_timeline_user_id_article_created_at",
+            "user_id",
+            "article_created_at",
+            "article_id",
+        ),
+    )
+
+    user_id: int = Field(
+        foreign_key="user.id",
+        primary_key=True,
+        ondelete="CASCADE",
+    )
+    article_id: int = Field(
+        foreign_key="article.id",
+        primary_key=True,
+        ondelete="CASCADE",
+        index=True,
+    )
+    article_created_at: datetime = Field(
+        sa_column=Column(
+            DateTime,
+            nullable=False,
+        )
+    )
+
+
 class User(SQLModel, table=True):  # type: ignore[call-arg]
     id: int | None = Field(
         nullable=False,
@@ -98,6 +132,14 @@ class User(SQLModel, table=True):  # type: ignore[call-arg]
 
 
 class Article(SQLModel, table=True):  # type: ignore[call-arg]
+    __table_args__ = (
+        Index("ix_article_created_at_id", "created_at", "id"),
+        Index("ix_article_author_id_created_at", "author_id", "created_at"),
+        Index("ix_article_tag_names", "tag_names", postgresql_using="gin"),
+    )
+    # UPDATE ... RETURNING brings back updated_at, so edits need no refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
     id: int | None = Field(
         nullable=False,
         unique=True,
@@ -120,6 +162,24 @@ class Article(SQLModel, table=True):  # type: ignore[call-arg]
         foreign_key="user.id",
         nullable=False,
     )
+    favorites_count: int = Field(
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("0")},
+    )
+    fanned_out: bool = Field(
+        default=False,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("false")},
+    )
+    tag_names: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(
+            ARRAY(Text),
+            nullable=False,
+            server_default=text("'{}'"),
+        ),
+    )
     created_at: datetime | None = Field(
         sa_column=Column(
             DateTime,
@@ -137,6 +197,22 @@ class Article(SQLModel, table=True):  # type: ignore[call-arg]
     )
 
 
+# The search vector is part of the table but deliberately left unmapped, so
+# loading an Article never pulls it; queries reference ARTICLE_SEARCH_VECTOR.
+ARTICLE_SEARCH_VECTOR = Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        "setweight(to_tsvector('english', title), 'A')"
+        " || setweight(to_tsvector('english', description), 'B')"
+        " || setweight(to_tsvector('english', body), 'C')",
+        persisted=True,
+    ),
+)
+Article.__table__.append_column(ARTICLE_SEARCH_VECTOR)  # type: ignore[attr-defined]
+Index("ix_article_search_vector", ARTICLE_SEARCH_VECTOR, postgresql_using="gin")
+
+
 class Tag(SQLModel, table=True):  # type: ignore[call-arg]
     id: int | None = Field(
         nullable=False,
@@ -163,6 +239,7 @@ class Comment(SQLModel, table=True):  # type: ignore[call-arg]
         foreign_key="article.id",
         nullable=False,
         ondelete="CASCADE",
+        index=True,
     )
     body: str = Field(
         nullable=False,
@@ -182,3 +259,13 @@ class Comment(SQLModel, table=True):  # type: ignore[call-arg]
             onupdate=func.now(),
         )
     )
+
+
+class RateLimitBucket(SQLModel, table=True):  # type: ignore[call-arg]
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: str = Field(primary_key=True)
+    tokens: float
+    refilled_at: float
+    allowed: bool
+
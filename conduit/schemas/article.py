@@ -92,7 +92,9 @@ class ArticleResponse(BaseModel):
 
 class ArticlesResponse(BaseModel):
     articles: List[ArticleData]
-    articles_count: int
+    articles_count: int | None
+    has_more: bool = False
+    next_cursor: str | None = None
 
     model_config = ConfigDict(
         alias_generator=to_camel,
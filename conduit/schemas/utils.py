@@ -24,12 +24,14 @@ def normalize_to_none(
     return handler(value)
 
 
+def format_datetime(dt: datetime) -> str:
+    return dt.replace(tzinfo=timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
 DatetimeISOFormat = Annotated[
     datetime,
     PlainSerializer(
-        lambda dt: dt.replace(tzinfo=timezone.utc)
-        .isoformat(timespec="microseconds")
-        .replace("+00:00", "Z"),
+        format_datetime,
         return_type=str,
         when_used="json",
     ),
@@ -1,11 +1,25 @@
-from typing import List, Tuple
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List, Tuple
 
+from sqlalchemy import CTE, Double, Row, cast, tuple_, union_all
 from sqlmodel import col, exists, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from conduit.core.cache import ARTICLE_FRAGMENTS, ARTICLES, RESPONSE_CACHE
+from conduit.core.database import on_commit
 from conduit.core.utils.slug import create_slug
-from conduit.models import Article, ArticleTag, Favorite, Follower, Tag, User
+from conduit.models import (
+    ARTICLE_SEARCH_VECTOR,
+    Article,
+    Favorite,
+    Follower,
+    Timeline,
+    User,
+)
 from conduit.schemas.article import ArticleRegister, ArticleUpdate
+from conduit.services import timeline as timeline_service
+
+STREAM_BATCH_SIZE = 100
 
 
 async def get_article_by_slug(
@@ -25,17 +39,30 @@ async def create_article(
     session: AsyncSession,
     author_id: int,
     request: ArticleRegister,
+    fanout_max_followers: int = 0,
 ) -> Article:
-
+    # Authors above the threshold are left to the pull side of the feed.
+    fanned_out = await timeline_service.should_fan_out(
+        session=session,
+        author_id=author_id,
+        max_followers=fanout_max_followers,
+    )
     instance = Article(
         slug=create_slug(request.title),
         title=request.title,
         description=request.description,
         body=request.body,
         author_id=author_id,
+        fanned_out=fanned_out,
     )
     session.add(instance)
-    await session.commit()
+    await session.flush()
+    if fanned_out:
+        await timeline_service.fan_out_article(
+            session=session,
+            article=instance,
+        )
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
     return instance
 
 
@@ -48,8 +75,9 @@ async def update_article(
     article_data = request.model_dump(exclude_unset=True)
     article.sqlmodel_update(article_data)
     session.add(article)
-    await session.commit()
-    await session.refresh(article)
+    await session.flush()
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
+    on_commit(session, ARTICLE_FRAGMENTS.invalidate, article.id)
     return article
 
 
@@ -59,175 +87,298 @@ async def delete_article(
     article: Article,
 ) -> None:
     await session.delete(article)
-    await session.commit()
+    await session.flush()
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
+    on_commit(session, ARTICLE_FRAGMENTS.invalidate, article.id)
+
+
+ArticleRow = Tuple[Article, User]
+
+
+def _user_id_by_username(*, username: str) -> Any:
+    return select(User.id).where(User.username == username).scalar_subquery()
+
+
+def _select_article_list_rows() -> Any:
+    # Listings never return the body, so only the columns ArticleData needs are
+    # projected and rows come back as plain tuples rather than ORM instances.
+    # Nothing here depends on the viewer; see viewer_service.get_viewer_state.
+    return select(
+        Article.id,
+        Article.author_id,
+        Article.slug,
+        Article.title,
+        Article.description,
+        Article.created_at,
+        Article.updated_at,
+        Article.favorites_count,
+        Article.tag_names,
+        User.username,
+        User.bio,
+        User.image,
+        col(User.updated_at).label("author_updated_at"),
+    ).join(User, Article.author_id == User.id)
+
 
+def _select_article_versions() -> Any:
+    # Every input of a rendered article that can change, and nothing else, so
+    # conditional requests are validated without loading text columns.
+    return select(
+        Article.id,
+        Article.author_id,
+        Article.updated_at,
+        Article.favorites_count,
+        Article.tag_names,
+        col(User.updated_at).label("author_updated_at"),
+    ).join(User, Article.author_id == User.id)
 
-async def get_article_author_tags_favorite(
+
+def _select_articles_page(
     *,
-    session: AsyncSession,
-    article_slug: str,
-    current_user_id: int | None,
-) -> Tuple[Article, User, bool, int, bool, str] | None:
-    if current_user_id is None:
-        current_user_id = 0
+    filtered: CTE,
+    limit: int,
+    offset: int,
+    cursor: Tuple[Any, int] | None,
+    versions_only: bool = False,
+) -> Any:
+    # The page of ids is picked from the filtered (id, sort_key) set before
+    # any join, and keyset mode seeks instead of skipping rows.
+    # One extra row is fetched to tell whether more follow.
+    page = select(filtered.c.id, filtered.c.sort_key)
+    if cursor is not None:
+        page = page.where(tuple_(filtered.c.sort_key, filtered.c.id) < tuple_(*cursor))
+    else:
+        page = page.offset(offset)
+    page = (
+        page.order_by(filtered.c.sort_key.desc(), filtered.c.id.desc())
+        .limit(limit + 1)
+        .subquery("page")
+    )
+    select_rows = _select_article_versions if versions_only else _select_article_list_rows
     query = (
-        select(
-            Article,
-            User,
-            exists()
-            .where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Article.author_id)
-            )
-            .label("following"),
-            select(func.count(Favorite.article_id))
-            .where(Favorite.article_id == Article.id)
-            .scalar_subquery()
-            .label("favorites_count"),
-            exists()
-            .where((Favorite.user_id == current_user_id) & (Favorite.article_id == Article.id))
-            .label("favorited"),
-            func.string_agg(Tag.name, ",").label("tags"),
-        )
-        .where(Article.slug == article_slug)
-        .join(User, Article.author_id == User.id)
-        .join(ArticleTag, Article.id == ArticleTag.article_id, isouter=True)
-        .join(Tag, Tag.id == ArticleTag.tag_id, isouter=True)
-        .group_by(Article, User)
+        select_rows()
+        .add_columns(page.c.sort_key)
+        .join(page, page.c.id == Article.id)
+        .order_by(page.c.sort_key.desc(), col(Article.id).desc())
     )
-    result = await session.exec(query)
-    return result.one_or_none()
+    return query
 
 
-async def get_articles_from_followed_authors(
+async def _get_articles_page(
     *,
     session: AsyncSession,
-    current_user_id: int,
+    filtered: CTE,
     limit: int,
     offset: int,
-) -> List[Tuple[Article, User, bool, int, bool, str]]:
-    query = (
-        select(
-            Article,
-            User,
-            exists()
-            .where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Article.author_id)
-            )
-            .label("following"),
-            select(func.count(Favorite.article_id))
-            .where(Favorite.article_id == Article.id)
-            .scalar_subquery()
-            .label("favorites_count"),
-            exists()
-            .where((Favorite.user_id == current_user_id) & (Favorite.article_id == Article.id))
-            .label("favorited"),
-            func.string_agg(Tag.name, ",").label("tags"),
+    cursor: Tuple[Any, int] | None,
+    with_count: bool,
+    versions_only: bool = False,
+    counted: Any = None,
+) -> Tuple[List[Row[Any]], int | None, bool]:
+    # Page rows and the total share the CTE, so both come back in a single
+    # statement. A CTE referenced twice is materialized by default, which
+    # would read every filtered row before the page; inlining it lets the page
+    # seek the sort index while the total is counted on its own. Callers whose
+    # CTE is already cut down to the page pass the full set as counted.
+    filtered = filtered.prefix_with("NOT MATERIALIZED")
+    if counted is None:
+        counted = filtered
+    query = _select_articles_page(
+        filtered=filtered,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        versions_only=versions_only,
+    )
+    if with_count:
+        query = query.add_columns(
+            select(func.count()).select_from(counted).scalar_subquery().label("articles_count"),
         )
+    result = await session.exec(query)
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not with_count:
+        return rows, None, has_more
+    if rows:
+        return rows, int(rows[0].articles_count), has_more
+    if offset == 0 and cursor is None:
+        return [], 0, False
+    # Past the last page there is no row to carry the total.
+    count_result = await session.exec(select(func.count()).select_from(counted))
+    return [], int(count_result.one()), False
+
+
+async def get_article_and_author(
+    *,
+    session: AsyncSession,
+    article_slug: str,
+) -> ArticleRow | None:
+    query = (
+        select(Article, User)
         .join(User, Article.author_id == User.id)
-        .join(ArticleTag, Article.id == ArticleTag.article_id, isouter=True)
-        .join(Tag, Tag.id == ArticleTag.tag_id, isouter=True)
-        .filter(
-            exists().where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Article.author_id)
-            )
-        )
-        .group_by(Article, User)
-        .limit(limit)
-        .offset(offset)
-        .order_by(col(Article.created_at).desc())
+        .where(Article.slug == article_slug)
     )
     result = await session.exec(query)
+    return result.one_or_none()
+
+
+async def get_article_list_rows_by_ids(
+    *,
+    session: AsyncSession,
+    article_ids: Iterable[int],
+) -> List[Row[Any]]:
+    query = _select_article_list_rows().where(col(Article.id).in_(article_ids))
+    result = await session.exec(query)
     return result.all()
 
 
-async def count_articles_from_followed_authors(
+async def get_article_version(
     *,
     session: AsyncSession,
-    current_user_id: int,
-) -> int:
-    query = (
-        select(func.count(Article.id))
-        .select_from(Article)
-        .filter(
-            exists().where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Article.author_id)
-            )
-        )
+    article_slug: str,
+) -> Row[Any] | None:
+    query = _select_article_versions().where(
+        Article.slug == article_slug,
     )
     result = await session.exec(query)
-    return int(result.one())
+    return result.one_or_none()
 
 
-async def get_articles_with_filters(
+async def get_articles_from_followed_authors(
     *,
     session: AsyncSession,
-    current_user_id: int | None,
-    tag: str | None,
-    author: str | None,
-    favorited: str | None,
+    current_user_id: int,
     limit: int,
     offset: int,
-) -> List[Tuple[Article, User, bool, int, bool, str]]:
-    if current_user_id is None:
-        current_user_id = 0
-    query = (
-        select(
-            Article,
-            User,
-            exists()
-            .where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Article.author_id)
-            )
-            .label("following"),
-            select(func.count(Favorite.article_id))
-            .where(Favorite.article_id == Article.id)
-            .scalar_subquery()
-            .label("favorites_count"),
-            exists()
-            .where((Favorite.user_id == current_user_id) & (Favorite.article_id == Article.id))
-            .label("favorited"),
-            func.string_agg(Tag.name, ",").label("tags"),
+    cursor: Tuple[datetime, int] | None = None,
+    with_count: bool = True,
+    versions_only: bool = False,
+) -> Tuple[List[Row[Any]], int | None, bool]:
+    # Fanned-out articles are a range scan over the user's timeline; articles
+    # from authors above the fan-out threshold are still pulled via Follower.
+    # Each side is read in index order and cut off at the end of the page, so
+    # neither is materialized in full; the total counts both sides uncut.
+    pushed = select(
+        col(Timeline.article_id).label("id"),
+        col(Timeline.article_created_at).label("sort_key"),
+    ).where(Timeline.user_id == current_user_id)
+    pulled = select(Article.id, col(Article.created_at).label("sort_key")).where(
+        ~col(Article.fanned_out),
+        exists().where(
+            (Follower.follower_id == current_user_id) & (Follower.following_id == Article.author_id)
+        ),
+    )
+    counted = union_all(pushed, pulled).subquery("feed_articles")
+    window = limit + 1 if cursor is not None else offset + limit + 1
+    if cursor is not None:
+        pushed = pushed.where(
+            tuple_(Timeline.article_created_at, Timeline.article_id) < tuple_(*cursor)
         )
-        .join(User, Article.author_id == User.id)
-        .join(ArticleTag, Article.id == ArticleTag.article_id, isouter=True)
-        .join(Tag, Tag.id == ArticleTag.tag_id, isouter=True)
-        .group_by(Article, User)
+        pulled = pulled.where(tuple_(Article.created_at, Article.id) < tuple_(*cursor))
+    pushed = pushed.order_by(
+        col(Timeline.article_created_at).desc(),
+        col(Timeline.article_id).desc(),
+    ).limit(window)
+    pulled = pulled.order_by(col(Article.created_at).desc(), col(Article.id).desc()).limit(window)
+    return await _get_articles_page(
+        session=session,
+        filtered=union_all(pushed, pulled).cte("filtered_articles"),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        with_count=with_count,
+        versions_only=versions_only,
+        counted=counted,
     )
+
+
+def _filter_articles(*, tag: str | None, author: str | None, favorited: str | None) -> CTE:
+    # Filters never join rows into the listing: usernames are resolved to ids
+    # once and each filter is an index probe on the article side.
+    query = select(Article.id, col(Article.created_at).label("sort_key"))
     if tag:
-        query = query.filter(Tag.name == tag)
+        query = query.where(col(Article.tag_names).contains([tag]))
     if author:
-        query = query.filter(User.username == author)
+        query = query.where(Article.author_id == _user_id_by_username(username=author))
     if favorited:
-        query = query.filter(
+        query = query.where(
             exists().where(
-                (User.username == favorited)
-                & (Favorite.user_id == User.id)
-                & (Favorite.article_id == Article.id),
+                (Favorite.article_id == Article.id)
+                & (Favorite.user_id == _user_id_by_username(username=favorited))
             )
         )
-    query = query.limit(limit).offset(offset).order_by(col(Article.created_at).desc())
-    result = await session.exec(query)
-    return result.all()
+    return query.cte("filtered_articles")
 
 
-async def count_articles_with_filters(
+async def get_articles_with_filters(
     *,
     session: AsyncSession,
     tag: str | None,
     author: str | None,
     favorited: str | None,
-) -> int:
-    query = select(func.count(Article.id)).select_from(Article)
-    if tag:
-        query = query.join(ArticleTag).join(Tag).filter(Tag.name == tag)
-    if author:
-        query = query.join(User).filter(User.username == author)
-    if favorited:
-        query = query.join(Favorite).join(User).filter(User.username == favorited)
-    result = await session.exec(query)
-    return int(result.one())
+    limit: int,
+    offset: int,
+    cursor: Tuple[datetime, int] | None = None,
+    with_count: bool = True,
+    versions_only: bool = False,
+) -> Tuple[List[Row[Any]], int | None, bool]:
+    return await _get_articles_page(
+        session=session,
+        filtered=_filter_articles(tag=tag, author=author, favorited=favorited),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        with_count=with_count,
+        versions_only=versions_only,
+    )
+
+
+async def stream_articles_with_filters(
+    *,
+    session: AsyncSession,
+    tag: str | None,
+    author: str | None,
+    favorited: str | None,
+    limit: int,
+    offset: int,
+    cursor: Tuple[datetime, int] | None = None,
+) -> AsyncIterator[List[Row[Any]]]:
+    # Rows come off a server-side cursor a batch at a time; like the paged
+    # variant, one row beyond the limit is read to tell whether more follow.
+    query = _select_articles_page(
+        filtered=_filter_articles(tag=tag, author=author, favorited=favorited),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    result = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for rows in result.partitions():
+        yield list(rows)
+
+
+async def search_articles(
+    *,
+    session: AsyncSession,
+    search: str,
+    limit: int,
+    offset: int,
+    cursor: Tuple[float, int] | None = None,
+    with_count: bool = True,
+    versions_only: bool = False,
+) -> Tuple[List[Row[Any]], int | None, bool]:
+    ts_query = func.websearch_to_tsquery("english", search)
+    # ts_rank is a real; as a double it round-trips exactly through the cursor.
+    query = select(
+        Article.id,
+        cast(func.ts_rank(ARTICLE_SEARCH_VECTOR, ts_query), Double).label("sort_key"),
+    ).where(ARTICLE_SEARCH_VECTOR.bool_op("@@")(ts_query))
+    return await _get_articles_page(
+        session=session,
+        filtered=query.cte("filtered_articles"),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        with_count=with_count,
+        versions_only=versions_only,
+    )
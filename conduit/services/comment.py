@@ -1,9 +1,10 @@
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
-from sqlmodel import delete, exists, select
+from sqlalchemy import Row
+from sqlmodel import col, delete, distinct, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from conduit.models import Comment, Follower, User
+from conduit.models import Article, Comment, User
 
 
 async def create_comment(
@@ -19,8 +20,7 @@ async def create_comment(
         author_id=user_id,
     )
     session.add(instance)
-    await session.commit()
-    await session.refresh(instance)
+    await session.flush()
     return instance
 
 
@@ -28,21 +28,9 @@ async def get_comments_and_users_by_article_id(
     *,
     session: AsyncSession,
     article_id: int,
-    current_user_id: int | None = None,
-) -> List[Tuple[Comment, User, bool]]:
-    if current_user_id is None:
-        current_user_id = 0
+) -> List[Tuple[Comment, User]]:
     query = (
-        select(
-            Comment,
-            User,
-            exists()
-            .where(
-                (Follower.follower_id == current_user_id)
-                & (Follower.following_id == Comment.author_id)
-            )
-            .label("following"),
-        )
+        select(Comment, User)
         .where(
             Comment.article_id == article_id,
         )
@@ -52,6 +40,33 @@ async def get_comments_and_users_by_article_id(
     return result.all()
 
 
+async def get_comments_version(
+    *,
+    session: AsyncSession,
+    article_slug: str,
+) -> Row[Any] | None:
+    # Aggregates over everything a rendered comment list depends on; one row
+    # per existing article, so a missing row means the article is gone.
+    query = (
+        select(
+            Article.id,
+            func.count(Comment.id).label("comments_count"),
+            func.max(Comment.id).label("last_comment_id"),
+            func.max(Comment.updated_at).label("comments_updated_at"),
+            func.max(User.updated_at).label("authors_updated_at"),
+            func.array_agg(distinct(Comment.author_id))
+            .filter(col(Comment.author_id).is_not(None))
+            .label("author_ids"),
+        )
+        .join(Comment, col(Comment.article_id) == Article.id, isouter=True)
+        .join(User, col(User.id) == Comment.author_id, isouter=True)
+        .where(Article.slug == article_slug)
+        .group_by(col(Article.id))
+    )
+    result = await session.exec(query)
+    return result.one_or_none()
+
+
 async def get_comment_by_id(
     *,
     session: AsyncSession,
@@ -73,7 +88,6 @@ async def delete_comment_by_id(
         (Comment.id == comment_id),
     )
     await session.exec(query)
-    await session.commit()
 
 
 async def delete_comments_by_article_id(
@@ -85,4 +99,3 @@ async def delete_comments_by_article_id(
         (Comment.article_id == article_id),
     )
     await session.exec(query)
-    await session.commit()
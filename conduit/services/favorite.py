@@ -1,28 +1,114 @@
-from sqlmodel import delete
+from typing import Any
+
+from sqlalchemy import CTE, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, delete, exists, func, literal, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from conduit.models import Favorite
+from conduit.core.cache import ARTICLE_FRAGMENTS, ARTICLES, RESPONSE_CACHE
+from conduit.core.database import on_commit, set_session_wrote
+from conduit.models import Article, Favorite, Follower, User
+
+
+def _article_id_by_slug(*, slug: str) -> Any:
+    return select(Article.id).where(Article.slug == slug).scalar_subquery()
+
+
+async def _write_favorite(
+    *,
+    session: AsyncSession,
+    user_id: int,
+    article_slug: str,
+    changed: CTE,
+    amount: int,
+) -> Row[Any] | None:
+    # The favorite write, the counter update and the row the response is
+    # rendered from are a single statement. A repeated favorite or unfavorite
+    # leaves the article row alone, so it writes no new row version and does
+    # not queue for the row lock; its count is the one the statement started
+    # with.
+    # Keep updated_at untouched: favoriting is not an edit of the article.
+    changed_rows = select(func.count()).select_from(changed).scalar_subquery()
+    updated = (
+        update(Article)
+        .where(Article.slug == article_slug, changed_rows > 0)
+        .values(
+            favorites_count=Article.favorites_count + amount * changed_rows,
+            updated_at=Article.updated_at,
+        )
+        .returning(col(Article.id), col(Article.favorites_count))
+        .cte("updated")
+    )
+    following = exists().where(
+        (Follower.follower_id == user_id) & (Follower.following_id == Article.author_id)
+    )
+    query = (
+        select(
+            Article,
+            User,
+            func.coalesce(updated.c.favorites_count, Article.favorites_count).label(
+                "favorites_count"
+            ),
+            following.label("following"),
+            (changed_rows > 0).label("changed"),
+        )
+        .join(User, Article.author_id == User.id)
+        .outerjoin(updated, updated.c.id == Article.id)
+        .where(Article.slug == article_slug)
+    )
+    result = await session.exec(query)
+    row = result.one_or_none()
+    if row is not None and row.changed:
+        set_session_wrote(session)
+        on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
+        on_commit(session, ARTICLE_FRAGMENTS.invalidate, row.Article.id)
+    return row
 
 
 async def favorite_article(
     *,
     session: AsyncSession,
     user_id: int,
-    article_id: int,
-) -> None:
-    favorite_db = Favorite(user_id=user_id, article_id=article_id)
-    session.add(favorite_db)
-    await session.commit()
+    article_slug: str,
+) -> Row[Any] | None:
+    inserted = (
+        insert(Favorite)
+        .from_select(
+            ["user_id", "article_id"],
+            select(literal(user_id), Article.id).where(Article.slug == article_slug),
+        )
+        .on_conflict_do_nothing(index_elements=[Favorite.user_id, Favorite.article_id])
+        .returning(col(Favorite.article_id))
+        .cte("inserted")
+    )
+    return await _write_favorite(
+        session=session,
+        user_id=user_id,
+        article_slug=article_slug,
+        changed=inserted,
+        amount=1,
+    )
 
 
 async def unfavorite_article(
     *,
     session: AsyncSession,
     user_id: int,
-    article_id: int,
-) -> None:
-    query = delete(Favorite).where(
-        (Favorite.user_id == user_id) & (Favorite.article_id == article_id),
+    article_slug: str,
+) -> Row[Any] | None:
+    deleted = (
+        delete(Favorite)
+        .where(
+            (Favorite.user_id == user_id)
+            & (Favorite.article_id == _article_id_by_slug(slug=article_slug))
+        )
+        .returning(col(Favorite.article_id))
+        .cte("deleted")
+    )
+    return await _write_favorite(
+        session=session,
+        user_id=user_id,
+        article_slug=article_slug,
+        changed=deleted,
+        amount=-1,
     )
-    await session.exec(query)
-    await session.commit()
@@ -2,6 +2,7 @@ from sqlmodel import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from conduit.models import Follower
+from conduit.services import timeline as timeline_service
 
 
 async def follow_user(
@@ -10,13 +11,18 @@ async def follow_user(
     follower_id: int,
     followed_id: int,
 ) -> None:
+    await timeline_service.lock_author(session=session, author_id=followed_id)
     session.add(
         Follower(
             follower_id=follower_id,
             following_id=followed_id,
         ),
     )
-    await session.commit()
+    await timeline_service.backfill_author(
+        session=session,
+        follower_id=follower_id,
+        followed_id=followed_id,
+    )
 
 
 async def unfollow_user(
@@ -25,8 +31,13 @@ async def unfollow_user(
     follower_id: int,
     followed_id: int,
 ) -> None:
+    await timeline_service.lock_author(session=session, author_id=followed_id)
     query = delete(Follower).where(
         (Follower.follower_id == follower_id) & (Follower.following_id == followed_id),
     )
     await session.exec(query)
-    await session.commit()
+    await timeline_service.prune_author(
+        session=session,
+        follower_id=follower_id,
+        followed_id=followed_id,
+    )
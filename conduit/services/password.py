@@ -1,10 +1,66 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from opentelemetry import metrics
 from passlib.context import CryptContext
 
+from conduit.core.settings import get_settings_cached
+from conduit.exceptions import PasswordHasherBusyException
+
+SETTINGS = get_settings_cached()
+
 PWD_CONTEXT = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
 )
 
+meter = metrics.get_meter("conduit.password")
+password_duration = meter.create_histogram(
+    name="conduit.password.duration",
+    unit="s",
+    description="Time to hash or verify a password, including time queued for a worker",
+)
+password_rejections = meter.create_counter(
+    name="conduit.password.rejections",
+    description="Password operations rejected because the hashing pool was saturated",
+)
+
+T = TypeVar("T")
+
+
+class PasswordHasherPool:
+    # A few threads keep bcrypt off the event loop; the pending limit turns a
+    # login burst into fast 503s instead of an ever-growing queue.
+
+    def __init__(self, *, max_workers: int, max_queue: int) -> None:
+        self.max_pending = max_workers + max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="conduit-password",
+        )
+        self._pending = 0
+
+    async def run(self, operation: str, function: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            password_rejections.add(1, {"operation": operation})
+            raise PasswordHasherBusyException()
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+            password_duration.record(time.perf_counter() - start, {"operation": operation})
+
+
+PASSWORD_POOL = PasswordHasherPool(
+    max_workers=SETTINGS.password_hash_workers,
+    max_queue=SETTINGS.password_hash_max_queue,
+)
+
 
 def verify_password(
     plain_password: str,
@@ -20,3 +76,16 @@ def get_password_hash(
     password: str,
 ) -> str:
     return PWD_CONTEXT.hash(password)
+
+
+async def verify_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> bool:
+    return await PASSWORD_POOL.run("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(
+    password: str,
+) -> str:
+    return await PASSWORD_POOL.run("hash", get_password_hash, password)
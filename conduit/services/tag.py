@@ -1,9 +1,33 @@
 from typing import List, Sequence
 
-from sqlmodel import col, delete, select
+from sqlalchemy import false, insert, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, delete, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from conduit.models import ArticleTag, Tag
+from conduit.core.cache import ARTICLE_FRAGMENTS, ARTICLES, RESPONSE_CACHE, TAGS
+from conduit.core.database import on_commit
+from conduit.models import Article, ArticleTag, Tag
+
+
+async def _set_article_tag_names(
+    *,
+    session: AsyncSession,
+    article_id: int,
+    tag_names: List[str],
+) -> None:
+    # Article.tag_names mirrors ArticleTag so reads need no tag joins; retagging
+    # is not an edit of the article, so updated_at is left as it was.
+    query = (
+        update(Article)
+        .where(Article.id == article_id)  # type: ignore[arg-type]
+        .values(
+            tag_names=tag_names,
+            updated_at=Article.updated_at,
+        )
+    )
+    await session.exec(query)
+    on_commit(session, ARTICLE_FRAGMENTS.invalidate, article_id)
 
 
 async def get_all_tags(
@@ -30,37 +54,59 @@ async def get_tags_by_article_id(
     return result.all()
 
 
+async def _get_or_create_tag_ids(
+    *,
+    session: AsyncSession,
+    tag_names: List[str],
+) -> tuple[List[int], bool]:
+    inserted = (
+        pg_insert(Tag)
+        .values([{"name": name} for name in tag_names])
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+        .returning(col(Tag.id), col(Tag.name))
+        .cte("inserted")
+    )
+    # Rows inserted by this statement are invisible to its own SELECT on tag,
+    # so both sides are read and flagged.
+    query = select(inserted.c.id, inserted.c.name, true()).union_all(
+        select(Tag.id, Tag.name, false()).where(col(Tag.name).in_(tag_names))
+    )
+    rows = (await session.exec(query)).all()
+    tag_ids = {name: tag_id for tag_id, name, _ in rows}
+    created = any(was_inserted for _, _, was_inserted in rows)
+    missing = [name for name in tag_names if name not in tag_ids]
+    if missing:
+        # A concurrent transaction committed these after our snapshot was taken.
+        result = await session.exec(select(Tag.id, Tag.name).where(col(Tag.name).in_(missing)))
+        tag_ids.update({name: tag_id for tag_id, name in result.all()})
+    return [tag_ids[name] for name in tag_names], created
+
+
 async def create_tags_for_article(
     *,
     session: AsyncSession,
     tag_names: List[str],
     article_id: int,
-) -> None:
-    tags: list[Tag] = []
+) -> List[str]:
     if not tag_names:
-        return
+        return []
 
-    query = select(Tag).where(
-        col(Tag.name).in_(tag_names),
-    )
-    result = await session.exec(query)
-    existing_tags = {tag.name: tag for tag in result.all()}
-    for name in tag_names:
-        tag = existing_tags.get(name)
-        if not tag:
-            tag = Tag(name=name)
-            session.add(tag)
-        tags.append(tag)
-    await session.commit()
-
-    for tag in tags:
-        session.add(
-            ArticleTag(
-                article_id=article_id,
-                tag_id=tag.id,
-            )
+    sorted_names = sorted(set(tag_names))
+    tag_ids, created = await _get_or_create_tag_ids(session=session, tag_names=sorted_names)
+    await session.exec(
+        insert(ArticleTag).values(
+            [{"article_id": article_id, "tag_id": tag_id} for tag_id in tag_ids]
         )
-    await session.commit()
+    )
+    await _set_article_tag_names(
+        session=session,
+        article_id=article_id,
+        tag_names=sorted_names,
+    )
+    if created:
+        on_commit(session, RESPONSE_CACHE.invalidate, TAGS)
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
+    return sorted_names
 
 
 async def delete_tags_for_article(
@@ -72,4 +118,9 @@ async def delete_tags_for_article(
         (ArticleTag.article_id == article_id),
     )
     await session.exec(query)
-    await session.commit()
+    await _set_article_tag_names(
+        session=session,
+        article_id=article_id,
+        tag_names=[],
+    )
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
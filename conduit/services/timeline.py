@@ -0,0 +1,87 @@
+from sqlmodel import col, delete, func, insert, literal, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from conduit.models import Article, Follower, Timeline, User
+
+
+async def lock_author(
+    *,
+    session: AsyncSession,
+    author_id: int,
+) -> None:
+    # Publishing, following and unfollowing an author all hold this lock until
+    # commit. Otherwise, under READ COMMITTED, a fan-out misses a follow that
+    # has not committed yet while that follow's backfill misses the new
+    # article, and the pull side skips fanned-out articles, so the follower
+    # never sees it. Likewise a fan-out could land after an unfollow's prune.
+    query = select(User.id).where(User.id == author_id).with_for_update(key_share=True)
+    await session.exec(query)
+
+
+async def should_fan_out(
+    *,
+    session: AsyncSession,
+    author_id: int,
+    max_followers: int,
+) -> bool:
+    if max_followers <= 0:
+        return False
+    await lock_author(session=session, author_id=author_id)
+    followers = (
+        select(Follower.follower_id)
+        .where(Follower.following_id == author_id)
+        .limit(max_followers + 1)
+        .subquery()
+    )
+    result = await session.exec(select(func.count()).select_from(followers))
+    return int(result.one()) <= max_followers
+
+
+async def fan_out_article(
+    *,
+    session: AsyncSession,
+    article: Article,
+) -> None:
+    followers = select(
+        Follower.follower_id,
+        literal(article.id),
+        literal(article.created_at),
+    ).where(Follower.following_id == article.author_id)
+    query = insert(Timeline).from_select(
+        ["user_id", "article_id", "article_created_at"],
+        followers,
+    )
+    await session.exec(query)  # type: ignore[call-overload]
+
+
+async def backfill_author(
+    *,
+    session: AsyncSession,
+    follower_id: int,
+    followed_id: int,
+) -> None:
+    articles = select(
+        literal(follower_id),
+        Article.id,
+        Article.created_at,
+    ).where(
+        (Article.author_id == followed_id) & Article.fanned_out,
+    )
+    query = insert(Timeline).from_select(
+        ["user_id", "article_id", "article_created_at"],
+        articles,
+    )
+    await session.exec(query)  # type: ignore[call-overload]
+
+
+async def prune_author(
+    *,
+    session: AsyncSession,
+    follower_id: int,
+    followed_id: int,
+) -> None:
+    articles = select(Article.id).where(Article.author_id == followed_id)
+    query = delete(Timeline).where(
+        (Timeline.user_id == follower_id) & col(Timeline.article_id).in_(articles),
+    )
+    await session.exec(query)
@@ -1,12 +1,38 @@
-from typing import Tuple
+from typing import Dict, NoReturn, Tuple, Type
 
-from sqlmodel import exists, select
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import exists, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from conduit.core.cache import ARTICLES, AUTHOR_FRAGMENTS, RESPONSE_CACHE, USER_CACHE
+from conduit.core.database import on_commit
+from conduit.core.settings import get_settings_cached
+from conduit.exceptions import (
+    BaseException,
+    UserEmailExistsException,
+    UserNameExistsException,
+)
 from conduit.models import Follower, User
 from conduit.schemas.user import UserRegistration, UserUpdate
 from conduit.services import password as password_service
 
+SETTINGS = get_settings_cached()
+
+UNIQUE_CONSTRAINT_EXCEPTIONS: Dict[str, Type[BaseException]] = {
+    "ix_user_email": UserEmailExistsException,
+    "ix_user_username": UserNameExistsException,
+}
+
+
+def _raise_for_unique_violation(ex: IntegrityError) -> NoReturn:
+    constraint_name = getattr(getattr(ex.orig, "diag", None), "constraint_name", None)
+    exception = UNIQUE_CONSTRAINT_EXCEPTIONS.get(constraint_name or "")
+    if exception is None:
+        raise ex
+    raise exception() from ex
+
 
 async def get_user_by_id(
     *,
@@ -22,6 +48,25 @@ async def get_user_by_id(
     return result.one_or_none()
 
 
+async def get_current_user_by_id(
+    *,
+    session: AsyncSession,
+    user_id: int | None,
+) -> User | None:
+    if user_id is None:
+        return None
+    values = USER_CACHE.get(user_id)
+    if values is not None:
+        user_copy = User(**values)
+        make_transient_to_detached(user_copy)
+        return user_copy
+    generation = USER_CACHE.generation()
+    user_db = await get_user_by_id(session=session, user_id=user_id)
+    if user_db is not None:
+        USER_CACHE.set(user_id, user_db.model_dump(), generation=generation)
+    return user_db
+
+
 async def get_user_by_email(
     *,
     session: AsyncSession,
@@ -60,14 +105,18 @@ async def create_user(
     user_registration: UserRegistration,
 ) -> User:
     user_data = user_registration.model_dump(exclude_unset=True)
-    user_data["hashed_password"] = password_service.get_password_hash(
+    user_data["hashed_password"] = await password_service.get_password_hash_async(
         password=user_data["password"].get_secret_value(),
     )
     del user_data["password"]
-    user_db = User(**user_data)
-    session.add(user_db)
-    await session.commit()
-    await session.refresh(user_db)
+    # Uniqueness is left to ix_user_email / ix_user_username, which also
+    # settles concurrent registrations.
+    query = select(User).from_statement(insert(User).values(**user_data).returning(User))
+    try:
+        result = await session.exec(query)
+        user_db = result.scalar_one()
+    except IntegrityError as ex:
+        _raise_for_unique_violation(ex)
     return user_db
 
 
@@ -79,13 +128,31 @@ async def update_user(
 ) -> User:
     user_data = user_update.model_dump(exclude_unset=True)
     if "password" in user_data:
-        user_data["hashed_password"] = password_service.get_password_hash(
+        user_data["hashed_password"] = await password_service.get_password_hash_async(
             password=user_data["password"].get_secret_value(),
         )
         del user_data["password"]
 
-    user_current.sqlmodel_update(user_data)
-    session.add(user_current)
-    await session.commit()
-    await session.refresh(user_current)
-    return user_current
+    # The current user may be a cached copy, so the row is rewritten and read
+    # back in one statement rather than flushed from that instance.
+    query = (
+        select(User)
+        .from_statement(
+            update(User).where(User.id == user_current.id).values(**user_data).returning(User)
+        )
+        .execution_options(populate_existing=True)
+    )
+    try:
+        result = await session.exec(query)
+        user_db = result.scalar_one()
+        if SETTINGS.user_cache_notify_channel:
+            await session.exec(
+                select(func.pg_notify(SETTINGS.user_cache_notify_channel, str(user_db.id)))
+            )
+    except IntegrityError as ex:
+        _raise_for_unique_violation(ex)
+    on_commit(session, USER_CACHE.invalidate, user_db.id)
+    # Listings embed the author's profile.
+    on_commit(session, RESPONSE_CACHE.invalidate, ARTICLES)
+    on_commit(session, AUTHOR_FRAGMENTS.invalidate, user_db.id)
+    return user_db
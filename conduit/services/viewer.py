@@ -0,0 +1,46 @@
+from typing import AbstractSet, Dict, Iterable, NamedTuple, Set
+
+from sqlmodel import col, literal, select, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from conduit.models import Favorite, Follower
+
+
+class ViewerState(NamedTuple):
+    following: AbstractSet[int] = frozenset()
+    favorited: AbstractSet[int] = frozenset()
+
+
+ANONYMOUS = ViewerState()
+
+
+async def get_viewer_state(
+    *,
+    session: AsyncSession,
+    current_user_id: int | None,
+    author_ids: Iterable[int] = (),
+    article_ids: Iterable[int] = (),
+) -> ViewerState:
+    # Article and comment rows carry no viewer columns; the viewer's follows
+    # and favorites among the ids on the page come back in one batched probe,
+    # and anonymous viewers skip it.
+    author_ids = set(author_ids)
+    article_ids = set(article_ids)
+    if current_user_id is None or not (author_ids or article_ids):
+        return ANONYMOUS
+    following = select(literal("following").label("kind"), col(Follower.following_id).label("id"))
+    following = following.where(
+        Follower.follower_id == current_user_id,
+        col(Follower.following_id).in_(author_ids),
+    )
+    favorited = select(literal("favorited").label("kind"), col(Favorite.article_id).label("id"))
+    favorited = favorited.where(
+        Favorite.user_id == current_user_id,
+        col(Favorite.article_id).in_(article_ids),
+    )
+    probes = union_all(following, favorited).subquery("viewer")
+    result = await session.exec(select(probes.c.kind, probes.c.id))
+    state: Dict[str, Set[int]] = {"following": set(), "favorited": set()}
+    for kind, id_ in result.all():
+        state[kind].add(id_)
+    return ViewerState(following=state["following"], favorited=state["favorited"])
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Iterator
+
+import pytest
+
+from sqlalchemy import Engine, create_engine, pool, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from alembic import command
+from alembic.config import Config
+from conduit.core.settings import get_settings_cached
+
+TABLES = (
+    "timeline",
+    "favorite",
+    "comment",
+    "articletag",
+    "follower",
+    "article",
+    "tag",
+    '"user"',
+)
+
+
+@pytest.fixture(scope="session")
+def database() -> Iterator[Engine]:
+    settings = get_settings_cached()
+    engine = create_engine(settings.database_uri.set(drivername="postgresql+psycopg"))
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("PostgreSQL is not available")
+    command.upgrade(Config("alembic.ini"), "head")
+    yield engine
+    engine.dispose()
+
+
+def _truncate(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture()
+def clean_database(database: Engine) -> Iterator[Engine]:
+    _truncate(database)
+    yield database
+    _truncate(database)
+
+
+@pytest.fixture()
+def async_engine(clean_database: Engine) -> Iterator[AsyncEngine]:
+    # Without a pool no connection outlives the event loop that opened it, so
+    # each asyncio.run in a test can share the engine.
+    engine = create_async_engine(get_settings_cached().database_uri, poolclass=pool.NullPool)
+    yield engine
+    asyncio.run(engine.dispose())
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from conduit.schemas.article import ArticleRegister
+from conduit.services import article as article_service
+from conduit.services import favorite as favorite_service
+from conduit.services import tag as tag_service
+
+ARTICLES = {
+    "first": (1, ["python", "sql", "web"]),
+    "second": (2, ["sql", "postgres"]),
+    "third": (1, ["web"]),
+}
+
+
+async def _list_articles(
+    engine: AsyncEngine,
+    filters: List[Dict[str, Any]],
+) -> List[Dict[str, List[str]]]:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        ids: Dict[str, int] = {}
+        slugs: Dict[str, str] = {}
+        for title, (author_id, tag_names) in ARTICLES.items():
+            article = await article_service.create_article(
+                session=session,
+                author_id=author_id,
+                request=ArticleRegister(title=title, description="d", body="b"),
+            )
+            ids[title] = article.id  # type: ignore[assignment]
+            slugs[title] = article.slug
+            await tag_service.create_tags_for_article(
+                session=session,
+                article_id=ids[title],
+                tag_names=tag_names,
+            )
+        for title in ("first", "third"):
+            await favorite_service.favorite_article(
+                session=session,
+                user_id=2,
+                article_slug=slugs[title],
+            )
+        results = []
+        for listing_filters in filters:
+            rows, articles_count, _ = await article_service.get_articles_with_filters(
+                session=session,
+                limit=20,
+                offset=0,
+                **{"tag": None, "author": None, "favorited": None, **listing_filters},
+            )
+            assert articles_count == len(rows)
+            results.append({row.title: row.tag_names for row in rows})
+    return results
+
+
+def test_filters_return_full_tag_lists(clean_database: Engine, async_engine: AsyncEngine) -> None:
+    with clean_database.begin() as connection:
+        connection.execute(
+            text(
+                'INSERT INTO "user" (username, email, hashed_password) '
+                "VALUES ('alice', 'alice@example.com', 'x'), ('bob', 'bob@example.com', 'x')"
+            )
+        )
+
+    by_tag, by_author, by_favorited, combined, unknown = asyncio.run(
+        _list_articles(
+            async_engine,
+            [
+                {"tag": "sql"},
+                {"author": "alice"},
+                {"favorited": "bob"},
+                {"tag": "web", "author": "alice", "favorited": "bob"},
+                {"author": "nobody"},
+            ],
+        )
+    )
+
+    assert by_tag == {"first": ["python", "sql", "web"], "second": ["postgres", "sql"]}
+    assert by_author == {"first": ["python", "sql", "web"], "third": ["web"]}
+    assert by_favorited == {"first": ["python", "sql", "web"], "third": ["web"]}
+    assert combined == by_favorited
+    assert unknown == {}
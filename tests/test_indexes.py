@@ -0,0 +1,183 @@
+import asyncio
+import re
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from conduit.services import article as article_service
+from conduit.services import comment as comment_service
+from conduit.services import favorite as favorite_service
+from conduit.services import follower as follower_service
+from conduit.services import tag as tag_service
+from conduit.services import timeline as timeline_service
+from conduit.services import user as user_service
+from conduit.services import viewer as viewer_service
+
+LARGE_TABLES = {"article", "articletag", "comment", "favorite", "follower", "timeline"}
+
+SEED = """
+INSERT INTO "user" (username, email, hashed_password)
+SELECT 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 500) AS n;
+INSERT INTO tag (name) SELECT 'tag' || n FROM generate_series(1, 200) AS n;
+INSERT INTO article (slug, title, description, body, author_id, created_at, updated_at)
+SELECT 'slug-' || n, 'title ' || n, 'description', repeat('body ', 50), n % 500 + 1,
+       now() - n * interval '1 minute', now() - n * interval '1 minute'
+FROM generate_series(1, 20000) AS n;
+INSERT INTO articletag (article_id, tag_id)
+SELECT id, id % 200 + 1 FROM article
+UNION ALL SELECT id, (id * 7) % 200 + 1 FROM article WHERE (id * 7) % 200 <> id % 200;
+UPDATE article SET tag_names = ARRAY(
+    SELECT tag.name FROM articletag JOIN tag ON tag.id = articletag.tag_id
+    WHERE articletag.article_id = article.id ORDER BY tag.name COLLATE "C"
+);
+INSERT INTO favorite (user_id, article_id)
+SELECT u, a FROM generate_series(1, 500) AS u, generate_series(1, 20000, 97) AS a;
+INSERT INTO follower (follower_id, following_id)
+SELECT u, (u + k) % 500 + 1 FROM generate_series(1, 500) AS u, generate_series(1, 10) AS k;
+INSERT INTO comment (author_id, article_id, body)
+SELECT n % 500 + 1, n % 20000 + 1, 'comment' FROM generate_series(1, 40000) AS n;
+UPDATE article SET fanned_out = true WHERE id % 2 = 0;
+INSERT INTO timeline (user_id, article_id, article_created_at)
+SELECT follower.follower_id, article.id, article.created_at
+FROM article JOIN follower ON follower.following_id = article.author_id
+WHERE article.fanned_out;
+"""
+
+
+def _seed(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for statement in SEED.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+        connection.execute(text("ANALYZE"))
+
+
+async def _capture_statements(
+    engine: AsyncEngine,
+    run: Callable[[AsyncSession], Awaitable[Any]],
+) -> List[Tuple[str, Any]]:
+    statements: List[Tuple[str, Any]] = []
+
+    def _capture(_conn, _cursor, statement, parameters, _context, _executemany):  # type: ignore
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await run(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+    return [
+        (statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"))
+    ]
+
+
+def _explain(engine: Engine, statement: str, parameters: Any) -> List[str]:
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+
+
+async def _run_services(session: AsyncSession) -> None:
+    listing = dict(session=session, limit=20, offset=0)
+    for filters in (
+        dict(tag="tag7", author=None, favorited=None),
+        dict(tag=None, author="user42", favorited=None),
+        dict(tag=None, author=None, favorited="user42"),
+    ):
+        await article_service.get_articles_with_filters(
+            **filters,  # type: ignore[arg-type]
+            **listing,  # type: ignore[arg-type]
+        )
+    await article_service.get_articles_with_filters(
+        tag=None,
+        author=None,
+        favorited=None,
+        with_count=False,
+        **listing,  # type: ignore[arg-type]
+    )
+    await article_service.get_articles_from_followed_authors(
+        current_user_id=1,
+        **listing,  # type: ignore[arg-type]
+    )
+    await article_service.get_articles_from_followed_authors(
+        current_user_id=1,
+        with_count=False,
+        cursor=(datetime(2020, 1, 1), 100),
+        **listing,  # type: ignore[arg-type]
+    )
+    await article_service.search_articles(
+        search="title 42",
+        **listing,  # type: ignore[arg-type]
+    )
+    await article_service.get_article_list_rows_by_ids(
+        session=session,
+        article_ids=range(100, 120),
+    )
+    await article_service.get_article_and_author(session=session, article_slug="slug-100")
+    await article_service.get_article_version(session=session, article_slug="slug-100")
+    await viewer_service.get_viewer_state(
+        session=session,
+        current_user_id=1,
+        author_ids=range(1, 21),
+        article_ids=range(1, 21),
+    )
+    await article_service.get_articles_with_filters(
+        tag="tag7",
+        author=None,
+        favorited=None,
+        versions_only=True,
+        **listing,  # type: ignore[arg-type]
+    )
+    await article_service.get_article_by_slug(session=session, slug="slug-100")
+    await comment_service.get_comments_version(session=session, article_slug="slug-100")
+    await comment_service.get_comments_and_users_by_article_id(session=session, article_id=100)
+    await tag_service.get_tags_by_article_id(session=session, article_id=100)
+    await user_service.get_user_by_username(
+        session=session,
+        username="user42",
+        current_user_id=1,
+    )
+    await timeline_service.should_fan_out(session=session, author_id=42, max_followers=100)
+    await favorite_service.unfavorite_article(session=session, user_id=1, article_slug="slug-98")
+    await follower_service.unfollow_user(session=session, follower_id=1, followed_id=3)
+    await follower_service.follow_user(session=session, follower_id=1, followed_id=3)
+
+
+def test_service_queries_use_indexes(clean_database: Engine, async_engine: AsyncEngine) -> None:
+    _seed(clean_database)
+
+    statements = asyncio.run(_capture_statements(async_engine, _run_services))
+    assert statements
+
+    for statement, parameters in statements:
+        plan = _explain(clean_database, statement, parameters)
+        scanned = set(re.findall(r"Seq Scan on (\w+)", "\n".join(plan)))
+        assert not scanned & LARGE_TABLES, "\n".join([statement, *plan])
+
+
+def test_counted_listing_seeks_created_at_index(
+    clean_database: Engine,
+    async_engine: AsyncEngine,
+) -> None:
+    _seed(clean_database)
+
+    async def run(session: AsyncSession) -> None:
+        await article_service.get_articles_with_filters(
+            session=session,
+            tag=None,
+            author=None,
+            favorited=None,
+            limit=20,
+            offset=0,
+            with_count=True,
+        )
+
+    [(statement, parameters)] = asyncio.run(_capture_statements(async_engine, run))
+    plan = "\n".join(_explain(clean_database, statement, parameters))
+    assert "ix_article_created_at_id" in plan, plan
+    assert "CTE Scan" not in plan, plan
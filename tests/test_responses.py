@@ -0,0 +1,161 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Type
+
+from pydantic import BaseModel
+
+from conduit.api.responses import (
+    render_article,
+    render_article_fragment,
+    render_articles,
+    render_author_fragment,
+    render_comments,
+    render_profile,
+)
+from conduit.models import Article, Comment, User
+from conduit.schemas.article import ArticleResponse, ArticlesResponse
+from conduit.schemas.comment import CommentsResponse
+from conduit.schemas.profile import ProfileResponse
+from conduit.services.viewer import ViewerState
+
+# Routes return rendered bytes, so FastAPI no longer checks them against the
+# declared response_model. Each body must validate against its schema and
+# serialize back to the same bytes.
+
+NOW = datetime(2026, 1, 1, 12, 30, 15, 250000)
+
+ListingRow = namedtuple(
+    "ListingRow",
+    [
+        "id",
+        "author_id",
+        "slug",
+        "title",
+        "description",
+        "created_at",
+        "updated_at",
+        "favorites_count",
+        "tag_names",
+        "username",
+        "bio",
+        "image",
+    ],
+)
+
+
+def _assert_round_trips(content: bytes, model: Type[BaseModel]) -> Any:
+    validated = model.model_validate_json(content)
+    assert validated.model_dump_json(by_alias=True).encode() == content
+    return validated
+
+
+def _user(user_id: int, username: str) -> User:
+    return User(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.com",
+        hashed_password="x",
+        bio='Café "quoted" bio',
+        image=None if user_id % 2 else "https://example.com/a.png",
+    )
+
+
+def test_render_article_matches_schema() -> None:
+    article = Article(
+        id=1,
+        slug="naive-cafe",
+        title="Naïve café",
+        description="d",
+        body="line\nbreak",
+        author_id=1,
+        created_at=NOW,
+        updated_at=NOW + timedelta(seconds=1),
+    )
+    content = render_article(
+        article=article,
+        author=_user(1, "alice"),
+        following=True,
+        favorited=False,
+        favorites_count=3,
+        tag_names=["python", "sql"],
+    )
+
+    response = _assert_round_trips(content, ArticleResponse)
+    assert response.article.body == "line\nbreak"
+    assert response.article.author.following
+
+
+def test_render_comments_matches_schema() -> None:
+    alice, bob = _user(1, "alice"), _user(2, "bob")
+    rows = [
+        (
+            Comment(
+                id=n,
+                author_id=user.id,
+                article_id=1,
+                body=f"c{n}",
+                created_at=NOW,
+                updated_at=NOW,
+            ),
+            user,
+        )
+        for n, user in enumerate((alice, bob, alice), start=1)
+    ]
+    content = render_comments(rows=rows, viewer=ViewerState(following={2}))
+
+    response = _assert_round_trips(content, CommentsResponse)
+    assert [comment.author.following for comment in response.comments] == [False, True, False]
+    _assert_round_trips(render_comments(rows=[], viewer=ViewerState()), CommentsResponse)
+
+
+def test_render_profile_matches_schema() -> None:
+    for following in (True, False):
+        content = render_profile(user=_user(2, "bob"), following=following)
+        assert _assert_round_trips(content, ProfileResponse).profile.following is following
+
+
+def test_render_articles_matches_schema() -> None:
+    rows = [
+        ListingRow(
+            id=n,
+            author_id=n % 2 + 1,
+            slug=f"article-{n}",
+            title=f"Article «{n}»",
+            description="description",
+            created_at=NOW - timedelta(minutes=n),
+            updated_at=NOW - timedelta(minutes=n),
+            favorites_count=n,
+            tag_names=[] if n == 3 else ["python", f"tag{n}"],
+            username=f"author{n % 2 + 1}",
+            bio=None,
+            image="https://example.com/a.png",
+        )
+        for n in range(1, 4)
+    ]
+    viewer = ViewerState(following={1}, favorited={2})
+    for articles_count, has_more, next_cursor in ((3, False, None), (None, True, "abc")):
+        content = render_articles(
+            rows=rows,
+            articles={row.id: render_article_fragment(row=row) for row in rows},
+            authors={row.author_id: render_author_fragment(row=row) for row in rows},
+            articles_count=articles_count,
+            has_more=has_more,
+            next_cursor=next_cursor,
+            viewer=viewer,
+        )
+
+        response = _assert_round_trips(content, ArticlesResponse)
+        assert [article.favorited for article in response.articles] == [False, True, False]
+        assert [article.author.following for article in response.articles] == [False, True, False]
+        assert response.next_cursor == next_cursor
+
+    empty = render_articles(
+        rows=[],
+        articles={},
+        authors={},
+        articles_count=0,
+        has_more=False,
+        next_cursor=None,
+        viewer=viewer,
+    )
+    assert _assert_round_trips(empty, ArticlesResponse).articles == []
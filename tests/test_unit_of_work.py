@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any, List, Tuple
+
+from pytest import MonkeyPatch
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from conduit.api.routes.article import router as articles_router
+from conduit.api.routes.comment import router as comments_router
+from conduit.api.routes.profile import router as profiles_router
+from conduit.api.routes.user import router as users_router
+from conduit.core.cache import RESPONSE_CACHE, USER_CACHE
+from conduit.core.database import (
+    ENGINE,
+    READ_YOUR_WRITES,
+    READ_YOUR_WRITES_COOKIE,
+    pin_reads_to_primary,
+)
+from conduit.exceptions import add_http_exception_handler
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+    add_http_exception_handler(app)
+    app.middleware("http")(pin_reads_to_primary)
+    for router in (users_router, articles_router, comments_router, profiles_router):
+        app.include_router(prefix="/api", router=router)
+    return app
+
+
+async def _count_commits() -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    commits: List[Session] = []
+
+    def count(session: Session) -> None:
+        commits.append(session)
+
+    USER_CACHE.clear()
+    RESPONSE_CACHE.invalidate("articles", "tags")
+    event.listen(Session, "after_commit", count)
+    results = []
+    pinned = []
+    transport = ASGITransport(app=_create_app())
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+
+            async def call(name: str, method: str, url: str, **kwargs: Any) -> Any:
+                commits.clear()
+                response = await client.request(method, url, **kwargs)
+                results.append((name, response.status_code, len(commits)))
+                if READ_YOUR_WRITES_COOKIE in response.cookies:
+                    pinned.append(name)
+                return response
+
+            tokens = {}
+            for username in ("alice", "bob"):
+                user = {"email": f"{username}@example.com", "username": username, "password": "x"}
+                response = await call("register", "POST", "/api/users", json={"user": user})
+                tokens[username] = {"Authorization": f"Token {response.json()['user']['token']}"}
+            alice, bob = tokens["alice"], tokens["bob"]
+
+            article = {"title": "Title", "description": "d", "body": "b", "tagList": ["a", "b"]}
+            response = await call(
+                "create article", "POST", "/api/articles", headers=alice, json={"article": article}
+            )
+            slug = response.json()["article"]["slug"]
+            await call(
+                "update article",
+                "PUT",
+                f"/api/articles/{slug}",
+                headers=alice,
+                json={"article": {"body": "new body", "tagList": ["b", "c"]}},
+            )
+            await call("favorite", "POST", f"/api/articles/{slug}/favorite", headers=bob)
+            await call("unfavorite", "DELETE", f"/api/articles/{slug}/favorite", headers=bob)
+            response = await call(
+                "comment",
+                "POST",
+                f"/api/articles/{slug}/comments",
+                headers=bob,
+                json={"comment": {"body": "hi"}},
+            )
+            comment_id = response.json()["comment"]["id"]
+            await call(
+                "delete comment",
+                "DELETE",
+                f"/api/articles/{slug}/comments/{comment_id}",
+                headers=bob,
+            )
+            await call("follow", "POST", "/api/profiles/alice/follow", headers=bob)
+            await call("unfollow", "DELETE", "/api/profiles/alice/follow", headers=bob)
+            await call(
+                "update user", "PUT", "/api/user", headers=bob, json={"user": {"bio": "hello"}}
+            )
+            await call(
+                "update user conflict",
+                "PUT",
+                "/api/user",
+                headers=bob,
+                json={"user": {"username": "alice"}},
+            )
+            await call("delete article", "DELETE", f"/api/articles/{slug}", headers=alice)
+    finally:
+        event.remove(Session, "after_commit", count)
+        await ENGINE.dispose()
+    return results, pinned
+
+
+def test_write_requests_commit_once(clean_database: Engine, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(READ_YOUR_WRITES, "enabled", True)
+    results, pinned = asyncio.run(_count_commits())
+
+    assert results == [
+        ("register", 201, 1),
+        ("register", 201, 1),
+        ("create article", 201, 1),
+        ("update article", 200, 1),
+        ("favorite", 200, 1),
+        ("unfavorite", 200, 1),
+        ("comment", 201, 1),
+        ("delete comment", 204, 1),
+        ("follow", 200, 1),
+        ("unfollow", 200, 1),
+        ("update user", 200, 1),
+        ("update user conflict", 409, 0),
+        ("delete article", 204, 1),
+    ]
+    # Every committed write keeps the client's reads on the primary for a while.
+    assert pinned == [name for name, _, commits in results if commits]
@@ -0,0 +1,90 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from conduit.exceptions import UserEmailExistsException, UserNameExistsException
+from conduit.schemas.user import UserRegistration, UserUpdate
+from conduit.services import user as user_service
+
+
+async def _register(engine: AsyncEngine, registrations: List[UserRegistration]) -> List[str]:
+    async def register(registration: UserRegistration) -> str:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            try:
+                user = await user_service.create_user(
+                    session=session,
+                    user_registration=registration,
+                )
+                await session.commit()
+            except (UserEmailExistsException, UserNameExistsException) as ex:
+                return type(ex).__name__
+            return user.username
+
+    results = await asyncio.gather(*(register(registration) for registration in registrations))
+    return list(results)
+
+
+def test_registration_conflicts_map_to_constraints(async_engine: AsyncEngine) -> None:
+    (alice,) = asyncio.run(
+        _register(
+            async_engine,
+            [UserRegistration(email="alice@example.com", username="alice", password="x")],
+        )
+    )
+    assert alice == "alice"
+
+    results = asyncio.run(
+        _register(
+            async_engine,
+            [
+                UserRegistration(email="alice@example.com", username="alice2", password="x"),
+                UserRegistration(email="alice2@example.com", username="alice", password="x"),
+            ],
+        )
+    )
+    assert results == ["UserEmailExistsException", "UserNameExistsException"]
+
+    racers = asyncio.run(
+        _register(
+            async_engine,
+            [
+                UserRegistration(email=f"racer{n}@example.com", username="racer", password="x")
+                for n in range(3)
+            ],
+        )
+    )
+    assert sorted(racers) == ["UserNameExistsException", "UserNameExistsException", "racer"]
+
+
+def test_update_conflict_maps_to_constraint(async_engine: AsyncEngine) -> None:
+    asyncio.run(
+        _register(
+            async_engine,
+            [
+                UserRegistration(email="alice@example.com", username="alice", password="x"),
+                UserRegistration(email="bob@example.com", username="bob", password="x"),
+            ],
+        )
+    )
+
+    async def update(user_update: UserUpdate) -> str:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            alice = await user_service.get_user_by_email(session=session, email="alice@example.com")
+            assert alice is not None
+            user = await user_service.update_user(
+                session=session,
+                user_update=user_update,
+                user_current=alice,
+            )
+            await session.commit()
+        return user.username
+
+    with pytest.raises(UserNameExistsException):
+        asyncio.run(update(UserUpdate(username="bob")))
+    with pytest.raises(UserEmailExistsException):
+        asyncio.run(update(UserUpdate(email="bob@example.com")))
+    assert asyncio.run(update(UserUpdate(username="alice", bio="hello"))) == "alice"